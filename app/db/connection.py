@@ -1,8 +1,12 @@
 from typing import AsyncGenerator
-from sqlalchemy import MetaData
+from uuid import uuid4
+from asyncpg import PostgresError
+from fastapi import Request
+from sqlalchemy import MetaData, event
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import NullPool
 
 from config import settings
@@ -10,21 +14,132 @@ from config import settings
 Base = declarative_base()
 metadata = MetaData()
 
+
+def get_engine_options() -> dict:
+    """
+    Build the keyword arguments used to create the database engine.
+
+    In the default mode connections are pooled, so the asyncpg prepared
+    statement cache survives between requests. In PgBouncer mode the
+    server-side statement caches are disabled and statements get unique
+    names, because a transaction pooler may hand each transaction a
+    different backend. Pool limits are derived from the global connection
+    budget shared by all worker processes. The default statement timeout
+    is sent when connecting, except through PgBouncer, which does not pass
+    it on; there it is set per transaction like the per-route timeouts.
+
+    Returns:
+        dict: Keyword arguments for `create_async_engine`.
+    """
+    if settings.DB_PGBOUNCER_MODE:
+        return {
+            "poolclass": NullPool,
+            "connect_args": {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            },
+        }
+
+    pool_size, max_overflow = settings.get_pool_limits(settings.WEB_CONCURRENCY or 1)
+    connect_args = {
+        "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+    }
+    if settings.DB_STATEMENT_TIMEOUT_SECONDS:
+        connect_args["server_settings"] = {
+            "statement_timeout": str(int(settings.DB_STATEMENT_TIMEOUT_SECONDS * 1000))
+        }
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_pre_ping": True,
+        "connect_args": connect_args,
+    }
+
+
 engine = create_async_engine(
-    settings.DATABASE_URL, poolclass=NullPool, echo=settings.DEBUG
+    settings.DATABASE_URL, echo=settings.DEBUG, **get_engine_options()
 )
 async_session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
-async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+@event.listens_for(Session, "after_begin")
+def set_statement_timeout(session, transaction, connection):
+    """
+    Apply the statement timeout chosen for the session's route to its transaction.
+    """
+    timeout = session.info.get("statement_timeout")
+    if timeout is not None:
+        connection.exec_driver_sql(
+            f"SET LOCAL statement_timeout = {int(timeout * 1000)}"
+        )
+
+
+def set_session_timeout(session: AsyncSession, timeout: float | None):
+    """
+    Give the transactions of a session their own statement timeout.
+
+    Nothing is set when the default timeout, sent when connecting, already
+    applies; through PgBouncer it always has to be set.
+
+    Args:
+        session (AsyncSession): The session.
+        timeout (float | None): The timeout in seconds; 0 or None means no limit.
+    """
+    if timeout != settings.DB_STATEMENT_TIMEOUT_SECONDS or (
+        settings.DB_PGBOUNCER_MODE and timeout
+    ):
+        session.info["statement_timeout"] = timeout or 0
+
+
+async def get_async_session(
+    request: Request,
+) -> AsyncGenerator[AsyncSession, None]:
     """
     Provide a SQLAlchemy asynchronous session generator.
 
     This generator provides an asynchronous session that can be used for
     database operations. The session is automatically closed after use.
+    Routes with their own statement timeout get it set at the start of
+    each transaction.
+
+    Args:
+        request (Request): The request the session is used for.
 
     Yields:
         AsyncSession: An asynchronous database session.
     """
+    route = request.scope.get("route")
+    timeout = settings.get_statement_timeout(getattr(route, "path", None))
     async with async_session_maker() as session:
+        set_session_timeout(session, timeout)
         yield session
+
+
+async def fetch_records(session: AsyncSession, query: str, *args) -> list[dict]:
+    """
+    Run a read query directly on the asyncpg connection of a session.
+
+    The query skips SQLAlchemy compilation, result processing and ORM
+    hydration; asyncpg still caches the prepared statement per connection.
+    Database errors are raised as `DBAPIError`, like those of the ORM path,
+    so that the same handlers apply, e.g. to statement timeouts.
+
+    Args:
+        session (AsyncSession): The database session providing the connection.
+        query (str): The SQL query, with `$1`-style parameters.
+        *args: The query parameters.
+
+    Raises:
+        DBAPIError: If the database rejects or cancels the query.
+
+    Returns:
+        list[dict]: The rows as plain dictionaries.
+    """
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    try:
+        records = await raw_connection.driver_connection.fetch(query, *args)
+    except PostgresError as exc:
+        raise DBAPIError(query, args, exc) from exc
+    return [dict(record) for record in records]
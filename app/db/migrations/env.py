@@ -1,13 +1,18 @@
+import logging
+import time
 from logging.config import fileConfig
 
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
 
 from alembic import context
 
 from config import settings
 from app.db.connection import metadata, Base
 from app.db.models import *
+from app.db.migrations.helpers import LOCK_TIMEOUT
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -37,6 +42,49 @@ target_metadata = [metadata, Base.metadata]
 # my_important_option = config.get_main_option("my_important_option")
 # ... etc.
 
+logger = logging.getLogger("alembic.env")
+
+# Every migration runs in its own transaction, so a migration may leave it
+# with `op.get_context().autocommit_block()` (e.g. for CREATE INDEX
+# CONCURRENTLY) and a failure keeps the migrations already applied. DDL
+# waits at most MIGRATION_LOCK_TIMEOUT_SECONDS for its table lock instead
+# of queueing the application's queries behind it. The helpers lift the
+# limit for what they run outside the transaction, so a timeout only rolls
+# back a migration transaction; work a migration already did outside of
+# it is kept, so such a migration must be safe to run again. A timed out
+# run is retried from the first unapplied migration, after dropping any
+# index an interrupted concurrent build left invalid.
+SESSION_SETTINGS = [
+    f"SET lock_timeout = '{LOCK_TIMEOUT}'",
+    "SET statement_timeout = 0",
+]
+LOCK_NOT_AVAILABLE = "55P03"
+
+INVALID_INDEXES = text("""
+    SELECT i.indexrelid::regclass::text
+    FROM pg_index i
+    JOIN pg_class t ON t.oid = i.indrelid
+    WHERE NOT i.indisvalid
+      AND t.relnamespace = to_regnamespace(current_schema())
+      AND t.relname = ANY(:tables)
+    """)
+
+
+def drop_invalid_indexes(connectable) -> None:
+    """Drop the invalid indexes of the application's tables.
+
+    `CREATE INDEX CONCURRENTLY ... IF NOT EXISTS` would keep an invalid
+    index left by an interrupted build instead of building it again.
+
+    """
+    tables = [table.name for meta in target_metadata for table in meta.sorted_tables]
+    with connectable.connect() as connection:
+        connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+        indexes = connection.execute(INVALID_INDEXES, {"tables": tables}).scalars()
+        for index in indexes.all():
+            logger.warning(f"Dropping invalid index {index}")
+            connection.exec_driver_sql(f"DROP INDEX CONCURRENTLY IF EXISTS {index}")
+
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
@@ -56,8 +104,11 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        transaction_per_migration=True,
     )
 
+    for statement in SESSION_SETTINGS:
+        context.execute(statement)
     with context.begin_transaction():
         context.run_migrations()
 
@@ -75,13 +126,33 @@ def run_migrations_online() -> None:
         poolclass=pool.NullPool,
     )
 
-    with connectable.connect() as connection:
-        context.configure(
-            connection=connection, target_metadata=target_metadata
-        )
-
-        with context.begin_transaction():
-            context.run_migrations()
+    attempts = settings.MIGRATION_LOCK_RETRIES + 1
+    for attempt in range(1, attempts + 1):
+        try:
+            with connectable.connect() as connection:
+                for statement in SESSION_SETTINGS:
+                    connection.exec_driver_sql(statement)
+                connection.commit()
+
+                context.configure(
+                    connection=connection,
+                    target_metadata=target_metadata,
+                    transaction_per_migration=True,
+                )
+
+                with context.begin_transaction():
+                    context.run_migrations()
+            return
+        except DBAPIError as exc:
+            sqlstate = getattr(exc.orig, "sqlstate", None)
+            if sqlstate != LOCK_NOT_AVAILABLE or attempt == attempts:
+                raise
+            delay = min(2**attempt, 30)
+            logger.warning(
+                f"Lock timeout (attempt {attempt}/{attempts}), retrying in {delay}s"
+            )
+            time.sleep(delay)
+            drop_invalid_indexes(connectable)
 
 
 if context.is_offline_mode():
@@ -0,0 +1,159 @@
+"""
+Building blocks for migrations that run while the application serves traffic.
+
+Index builds use `CREATE INDEX CONCURRENTLY`, which cannot run inside a
+transaction, and backfills are split into short transactions so they never
+hold row locks on a large part of a table. Both wait for locks as long as
+needed: `lock_timeout` only guards the DDL run in migration transactions,
+since a build cancelled by it leaves an invalid index behind.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+
+import sqlalchemy as sa
+from alembic import op
+
+from config import settings
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+LOCK_TIMEOUT = f"{int(settings.MIGRATION_LOCK_TIMEOUT_SECONDS * 1000)}ms"
+
+INDEX_IS_VALID = sa.text(
+    "SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"
+)
+
+
+def index_is_valid(name: str) -> bool | None:
+    """
+    Check whether an index exists and is usable.
+
+    A failed or cancelled `CREATE INDEX CONCURRENTLY` leaves an invalid index
+    behind, which `IF NOT EXISTS` would otherwise keep forever.
+
+    Args:
+        name (str): The index name.
+
+    Returns:
+        bool | None: Whether the index is valid, None if it does not exist or
+            the migration is rendered as SQL.
+    """
+    if op.get_context().as_sql:
+        return None
+    return op.get_bind().execute(INDEX_IS_VALID, {"name": name}).scalar()
+
+
+@contextmanager
+def autocommit_without_lock_timeout():
+    """
+    Run statements outside the migration transaction, waiting for locks without limit.
+    """
+    with op.get_context().autocommit_block():
+        op.execute("SET lock_timeout = 0")
+        try:
+            yield
+        finally:
+            op.execute(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+
+
+def create_index_concurrently(name: str, table: str, columns: list[str], **kwargs):
+    """
+    Build an index without blocking writes, replacing an invalid leftover.
+
+    Args:
+        name (str): The index name.
+        table (str): The table to index.
+        columns (list[str]): The indexed columns.
+        **kwargs: Passed on to `op.create_index`, e.g. `postgresql_using`.
+    """
+    with autocommit_without_lock_timeout():
+        if index_is_valid(name) is False:
+            logger.warning(f"Rebuilding invalid index {name}")
+            op.drop_index(
+                name, table_name=table, postgresql_concurrently=True, if_exists=True
+            )
+        op.create_index(
+            name,
+            table,
+            columns,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+            **kwargs,
+        )
+
+
+def drop_index_concurrently(name: str, table: str):
+    """
+    Drop an index without blocking reads and writes of its table.
+
+    Args:
+        name (str): The index name.
+        table (str): The indexed table.
+    """
+    with autocommit_without_lock_timeout():
+        op.drop_index(
+            name, table_name=table, postgresql_concurrently=True, if_exists=True
+        )
+
+
+def set_lock_timeout(seconds: float):
+    """
+    Override the lock timeout for the rest of the current migration transaction.
+
+    Args:
+        seconds (float): How long a statement may wait for a lock.
+    """
+    op.execute(f"SET LOCAL lock_timeout = '{int(seconds * 1000)}ms'")
+
+
+def batched_update(
+    table: str,
+    assignments: str,
+    where: str,
+    batch_size: int = 10_000,
+    pause_seconds: float = 0,
+):
+    """
+    Update the matching rows in batches, committing after each batch.
+
+    The `where` condition must stop matching a row once it is updated,
+    e.g. `change_seq IS NULL`, otherwise the update never finishes.
+
+    Args:
+        table (str): The table to update; it must have an `id` primary key.
+        assignments (str): The SQL `SET` clause, e.g. "change_seq = 0".
+        where (str): The SQL condition selecting the rows still to update.
+        batch_size (int): Rows updated per transaction.
+        pause_seconds (float): Sleep between batches to leave room for other writes.
+    """
+    statement = (
+        f"UPDATE {table} SET {assignments} WHERE id IN "
+        f"(SELECT id FROM {table} WHERE {where} LIMIT {batch_size})"
+    )
+    with autocommit_without_lock_timeout():
+        if op.get_context().as_sql:
+            op.execute(
+                f"DO $$\n"
+                f"DECLARE updated integer;\n"
+                f"BEGIN\n"
+                f"    LOOP\n"
+                f"        {statement};\n"
+                f"        GET DIAGNOSTICS updated = ROW_COUNT;\n"
+                f"        COMMIT;\n"
+                f"        EXIT WHEN updated < {batch_size};\n"
+                f"    END LOOP;\n"
+                f"END $$"
+            )
+            return
+
+        total = 0
+        while True:
+            updated = op.get_bind().execute(sa.text(statement)).rowcount
+            total += updated
+            if updated < batch_size:
+                break
+            logger.info(f"Updated {total} rows of {table}")
+            time.sleep(pause_seconds)
+        logger.info(f"Updated {total} rows of {table}")
@@ -0,0 +1,113 @@
+"""change feed horizon
+
+Revision ID: 43db6224aad8
+Revises: e02cbeae0aaa
+Create Date: 2026-10-19 19:52:31.402118
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "43db6224aad8"
+down_revision: Union[str, None] = "e02cbeae0aaa"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# A change sequence number is the writing transaction's ID shifted left by
+# 24 bits plus a counter kept in a transaction-local setting. Numbers grow
+# with transaction IDs, so every number below the oldest transaction still
+# running (`pg_snapshot_xmin`) is final, and readers stop there instead of
+# writers serializing on a lock. Numbers drawn from the old sequence are
+# all smaller, so existing cursors stay valid.
+NEXT_CHANGE_SEQ = """
+CREATE OR REPLACE FUNCTION next_change_seq() RETURNS bigint AS $$
+DECLARE
+    ordinal bigint := coalesce(
+        nullif(current_setting('faq.change_ordinal', true), ''), '0'
+    )::bigint + 1;
+BEGIN
+    IF ordinal >= 16777216 THEN
+        RAISE EXCEPTION 'more than 16777215 changes in one transaction';
+    END IF;
+    PERFORM set_config('faq.change_ordinal', ordinal::text, true);
+    RETURN (pg_current_xact_id()::text::bigint << 24) + ordinal;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+ASSIGN_CHANGE_SEQ = """
+CREATE OR REPLACE FUNCTION assign_change_seq() RETURNS trigger AS $$
+BEGIN
+    NEW.change_seq := next_change_seq();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# Topics removed by the cascade of a subject delete get no tombstone of
+# their own; the subject's tombstone covers them.
+RECORD_TOMBSTONE = """
+CREATE OR REPLACE FUNCTION record_tombstone() RETURNS trigger AS $$
+BEGIN
+    IF TG_ARGV[0] = 'topic' THEN
+        IF EXISTS (SELECT 1 FROM subjects WHERE id = OLD.subject_id) THEN
+            INSERT INTO tombstones (change_seq, entity, entity_id, subject_id, deleted_at)
+            VALUES (next_change_seq(), TG_ARGV[0], OLD.id, OLD.subject_id, now());
+        END IF;
+    ELSE
+        INSERT INTO tombstones (change_seq, entity, entity_id, subject_id, deleted_at)
+        VALUES (next_change_seq(), TG_ARGV[0], OLD.id, OLD.id, now());
+    END IF;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+PREVIOUS_ASSIGN_CHANGE_SEQ = """
+CREATE OR REPLACE FUNCTION assign_change_seq() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('change_seq'));
+    NEW.change_seq := nextval('change_seq');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+PREVIOUS_RECORD_TOMBSTONE = """
+CREATE OR REPLACE FUNCTION record_tombstone() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('change_seq'));
+    IF TG_ARGV[0] = 'topic' THEN
+        INSERT INTO tombstones (change_seq, entity, entity_id, subject_id, deleted_at)
+        VALUES (nextval('change_seq'), TG_ARGV[0], OLD.id, OLD.subject_id, now());
+    ELSE
+        INSERT INTO tombstones (change_seq, entity, entity_id, subject_id, deleted_at)
+        VALUES (nextval('change_seq'), TG_ARGV[0], OLD.id, OLD.id, now());
+    END IF;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    op.execute(NEXT_CHANGE_SEQ)
+    op.execute(ASSIGN_CHANGE_SEQ)
+    op.execute(RECORD_TOMBSTONE)
+
+
+def downgrade() -> None:
+    # Numbers handed out by the old sequence must stay above the new ones.
+    op.execute(
+        "SELECT setval('change_seq', greatest("
+        "(SELECT max(change_seq) FROM subjects), "
+        "(SELECT max(change_seq) FROM topics), "
+        "(SELECT max(change_seq) FROM tombstones), 1))"
+    )
+    op.execute(PREVIOUS_RECORD_TOMBSTONE)
+    op.execute(PREVIOUS_ASSIGN_CHANGE_SEQ)
+    op.execute("DROP FUNCTION IF EXISTS next_change_seq()")
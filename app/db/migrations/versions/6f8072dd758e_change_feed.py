@@ -0,0 +1,98 @@
+"""change feed
+
+Revision ID: 6f8072dd758e
+Revises: f552a4ae68dc
+Create Date: 2026-10-19 19:09:20.847760
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.migrations.helpers import batched_update, create_index_concurrently
+
+# revision identifiers, used by Alembic.
+revision: str = "6f8072dd758e"
+down_revision: Union[str, None] = "f552a4ae68dc"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Writers take a transaction-level advisory lock before drawing a number, so
+# change_seq values become visible in the order they were assigned and a
+# client cursor can never skip a row committed late.
+ASSIGN_CHANGE_SEQ = """
+CREATE OR REPLACE FUNCTION assign_change_seq() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('change_seq'));
+    NEW.change_seq := nextval('change_seq');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+RECORD_TOMBSTONE = """
+CREATE OR REPLACE FUNCTION record_tombstone() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('change_seq'));
+    INSERT INTO tombstones (change_seq, entity, entity_id, deleted_at)
+    VALUES (nextval('change_seq'), TG_ARGV[0], OLD.id, now());
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    # Every step can run again: a run that stopped after the first commit
+    # below is resumed by running the migration again.
+    op.execute("CREATE SEQUENCE IF NOT EXISTS change_seq")
+    op.execute(
+        "CREATE TABLE IF NOT EXISTS tombstones ("
+        "change_seq BIGINT NOT NULL PRIMARY KEY, "
+        "entity VARCHAR(16) NOT NULL, "
+        "entity_id INTEGER NOT NULL, "
+        "deleted_at TIMESTAMP WITHOUT TIME ZONE NOT NULL)"
+    )
+    # A nullable column without a default is added without rewriting the table.
+    op.execute("ALTER TABLE subjects ADD COLUMN IF NOT EXISTS change_seq BIGINT")
+    op.execute("ALTER TABLE topics ADD COLUMN IF NOT EXISTS change_seq BIGINT")
+
+    op.execute(ASSIGN_CHANGE_SEQ)
+    op.execute(RECORD_TOMBSTONE)
+    for table, entity in (("subjects", "subject"), ("topics", "topic")):
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_change_seq ON {table}")
+        op.execute(
+            f"CREATE TRIGGER {table}_change_seq BEFORE INSERT OR UPDATE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION assign_change_seq()"
+        )
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_tombstone ON {table}")
+        op.execute(
+            f"CREATE TRIGGER {table}_tombstone AFTER DELETE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION record_tombstone('{entity}')"
+        )
+
+    # The indexes come first so that every backfill batch finds its rows
+    # through them instead of scanning the table.
+    create_index_concurrently("ix_subjects_change_seq", "subjects", ["change_seq"])
+    create_index_concurrently("ix_topics_change_seq", "topics", ["change_seq"])
+
+    # The trigger assigns the sequence number to existing rows; short
+    # batches keep row locks brief while the application is writing.
+    for table in ("subjects", "topics"):
+        batched_update(table, "change_seq = 0", "change_seq IS NULL")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_topics_change_seq", table_name="topics")
+    op.drop_index("ix_subjects_change_seq", table_name="subjects")
+    for table in ("subjects", "topics"):
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_tombstone ON {table}")
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_change_seq ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS record_tombstone()")
+    op.execute("DROP FUNCTION IF EXISTS assign_change_seq()")
+    op.drop_column("topics", "change_seq")
+    op.drop_column("subjects", "change_seq")
+    op.drop_table("tombstones")
+    op.execute("DROP SEQUENCE IF EXISTS change_seq")
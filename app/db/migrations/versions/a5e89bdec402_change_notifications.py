@@ -0,0 +1,77 @@
+"""change notifications
+
+Revision ID: a5e89bdec402
+Revises: 6f8072dd758e
+Create Date: 2026-10-19 19:10:54.148443
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "a5e89bdec402"
+down_revision: Union[str, None] = "6f8072dd758e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+RECORD_TOMBSTONE = """
+CREATE OR REPLACE FUNCTION record_tombstone() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('change_seq'));
+    IF TG_ARGV[0] = 'topic' THEN
+        INSERT INTO tombstones (change_seq, entity, entity_id, subject_id, deleted_at)
+        VALUES (nextval('change_seq'), TG_ARGV[0], OLD.id, OLD.subject_id, now());
+    ELSE
+        INSERT INTO tombstones (change_seq, entity, entity_id, subject_id, deleted_at)
+        VALUES (nextval('change_seq'), TG_ARGV[0], OLD.id, OLD.id, now());
+    END IF;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+PREVIOUS_RECORD_TOMBSTONE = """
+CREATE OR REPLACE FUNCTION record_tombstone() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('change_seq'));
+    INSERT INTO tombstones (change_seq, entity, entity_id, deleted_at)
+    VALUES (nextval('change_seq'), TG_ARGV[0], OLD.id, now());
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# One notification per statement; Postgres also folds identical
+# notifications within a transaction, so a cascade over many rows costs
+# a single message.
+NOTIFY_CHANGES = """
+CREATE OR REPLACE FUNCTION notify_changes() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('faq_changes', '');
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    op.add_column("tombstones", sa.Column("subject_id", sa.Integer(), nullable=True))
+    op.execute(RECORD_TOMBSTONE)
+    op.execute(NOTIFY_CHANGES)
+    for table in ("subjects", "topics"):
+        op.execute(
+            f"CREATE TRIGGER {table}_notify "
+            f"AFTER INSERT OR UPDATE OR DELETE ON {table} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION notify_changes()"
+        )
+
+
+def downgrade() -> None:
+    for table in ("subjects", "topics"):
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_notify ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS notify_changes()")
+    op.execute(PREVIOUS_RECORD_TOMBSTONE)
+    op.drop_column("tombstones", "subject_id")
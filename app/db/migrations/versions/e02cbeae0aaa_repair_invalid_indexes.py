@@ -0,0 +1,44 @@
+"""repair invalid indexes
+
+Revision ID: e02cbeae0aaa
+Revises: a5e89bdec402
+Create Date: 2026-10-19 19:40:12.518305
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.migrations.helpers import create_index_concurrently
+
+# revision identifiers, used by Alembic.
+revision: str = "e02cbeae0aaa"
+down_revision: Union[str, None] = "a5e89bdec402"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRGM = {"postgresql_using": "gin", "postgresql_ops": {"title": "gin_trgm_ops"}}
+
+# The earlier migrations built these with IF NOT EXISTS, which keeps an
+# index left invalid by an interrupted concurrent build. Rebuild any such
+# index; valid ones are left untouched.
+INDEXES = [
+    ("ix_subjects_title", "subjects", ["title"], {}),
+    ("ix_subjects_title_trgm", "subjects", ["title"], TRGM),
+    ("ix_subjects_change_seq", "subjects", ["change_seq"], {}),
+    ("ix_topics_subject_id_id", "topics", ["subject_id", "id"], {}),
+    ("ix_topics_title", "topics", ["title"], {}),
+    ("ix_topics_title_trgm", "topics", ["title"], TRGM),
+    ("ix_topics_change_seq", "topics", ["change_seq"], {}),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns, kwargs in INDEXES:
+        create_index_concurrently(name, table, columns, unique=False, **kwargs)
+
+
+def downgrade() -> None:
+    pass
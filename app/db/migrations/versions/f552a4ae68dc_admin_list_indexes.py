@@ -0,0 +1,103 @@
+"""admin list indexes
+
+Revision ID: f552a4ae68dc
+Revises: 8a1c8b852f64
+Create Date: 2026-10-19 19:07:59.252824
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "f552a4ae68dc"
+down_revision: Union[str, None] = "8a1c8b852f64"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Build the indexes without blocking writes to the tables.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_subjects_title",
+            "subjects",
+            ["title"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_subjects_title_trgm",
+            "subjects",
+            ["title"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_topics_subject_id_id",
+            "topics",
+            ["subject_id", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_topics_title",
+            "topics",
+            ["title"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_topics_title_trgm",
+            "topics",
+            ["title"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_topics_title_trgm",
+            table_name="topics",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_topics_title",
+            table_name="topics",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_topics_subject_id_id",
+            table_name="topics",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_subjects_title_trgm",
+            table_name="subjects",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_subjects_title",
+            table_name="subjects",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
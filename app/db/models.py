@@ -1,10 +1,13 @@
 from app.db.connection import Base
 from sqlalchemy import (
+    BigInteger,
     Column,
+    FetchedValue,
     Integer,
     String,
     DateTime,
     ForeignKey,
+    Index,
     Text,
 )
 from sqlalchemy.orm import relationship
@@ -19,11 +22,18 @@ class BaseModel:
         id (int): The primary key identifier.
         created_at (datetime): The timestamp when the record was created.
         updated_at (datetime | None): The timestamp of the last update to the record, or None if never updated.
+        change_seq (int): Position of the last insert or update in the change feed, assigned by a database trigger.
     """
 
     id = Column(Integer, primary_key=True, index=True)
     created_at = Column(DateTime, default=datetime.now())
     updated_at = Column(DateTime, onupdate=datetime.now(), nullable=True)
+    change_seq = Column(
+        BigInteger,
+        server_default=FetchedValue(),
+        server_onupdate=FetchedValue(),
+        index=True,
+    )
 
 
 class SubjectModel(Base, BaseModel):
@@ -36,11 +46,25 @@ class SubjectModel(Base, BaseModel):
     """
 
     __tablename__ = "subjects"
+    __table_args__ = (
+        Index("ix_subjects_title", "title"),
+        Index(
+            "ix_subjects_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+    )
 
     title: str = Column(String(255), nullable=False)
 
+    # Child topics are removed by the ON DELETE CASCADE foreign key, so the
+    # ORM must not load them when a subject is deleted.
     topics = relationship(
-        "TopicModel", cascade="all, delete-orphan", back_populates="subject"
+        "TopicModel",
+        cascade="all, delete-orphan",
+        back_populates="subject",
+        passive_deletes=True,
     )
 
     def __repr__(self):
@@ -59,6 +83,16 @@ class TopicModel(Base, BaseModel):
     """
 
     __tablename__ = "topics"
+    __table_args__ = (
+        Index("ix_topics_subject_id_id", "subject_id", "id"),
+        Index("ix_topics_title", "title"),
+        Index(
+            "ix_topics_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+    )
 
     title: str = Column(String(255), nullable=False)
     description: str = Column(Text, nullable=False)
@@ -70,3 +104,30 @@ class TopicModel(Base, BaseModel):
 
     def __repr__(self):
         return f"Topic: {self.title}"
+
+
+class TombstoneModel(Base):
+    """
+    ORM model for the tombstones table, written by a trigger on every delete.
+
+    Deleting a subject records one tombstone, which also stands for the
+    topics removed with it by the cascading foreign key.
+
+    Attributes:
+        change_seq (int): Position of the delete in the change feed.
+        entity (str): The kind of deleted record, "subject" or "topic".
+        entity_id (int): The ID of the deleted record.
+        subject_id (int | None): The subject the record belonged to; for subjects, their own ID.
+        deleted_at (datetime): The timestamp of the deletion.
+    """
+
+    __tablename__ = "tombstones"
+
+    change_seq: int = Column(BigInteger, primary_key=True)
+    entity: str = Column(String(16), nullable=False)
+    entity_id: int = Column(Integer, nullable=False)
+    subject_id: int = Column(Integer, nullable=True)
+    deleted_at: datetime = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"Tombstone: {self.entity} {self.entity_id}"
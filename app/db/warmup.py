@@ -0,0 +1,58 @@
+import asyncio
+
+from sqlalchemy import text
+
+from app.db.connection import async_session_maker, engine
+from app.services import subjects, topics
+from app.utils.logging_configs import logger
+from config import settings
+
+
+def get_warm_up_statements() -> list:
+    """
+    Collect the cached service statements executed during warm-up.
+
+    Only reads are warmed, with an ID that never exists. Executing the
+    write statements, even in a transaction that is rolled back, would lock
+    the tables and fire their triggers on every worker start, and could
+    queue behind a migration's lock; they are prepared on first use.
+
+    Returns:
+        list: Pairs of (statement, parameters).
+    """
+    return [
+        (text("SELECT 1"), None),
+        (subjects.select_subject_by_id(0), None),
+        (topics.select_topic_by_id(0), None),
+        (subjects.select_topic_page(0, 0, 1), None),
+    ]
+
+
+async def warm_up_connection():
+    """
+    Open one pooled connection and prepare the service reads on it.
+    """
+    async with async_session_maker() as session:
+        for stmt, params in get_warm_up_statements():
+            await session.execute(stmt, params)
+        await session.rollback()
+
+
+async def warm_up():
+    """
+    Fill the connection pool and prime the compiled and prepared statement caches.
+
+    Connections are opened concurrently so each one is a separate pool
+    checkout. Failures are logged and do not prevent the worker from
+    starting; `/readyz` reports the database state separately.
+
+    Returns:
+        bool: True if the warm-up completed.
+    """
+    connections = 1 if settings.DB_PGBOUNCER_MODE else engine.pool.size()
+    try:
+        await asyncio.gather(*(warm_up_connection() for _ in range(connections)))
+    except Exception as exc:
+        logger.warning(f"Warm-up failed: {exc!r}")
+        return False
+    return True
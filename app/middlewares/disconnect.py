@@ -0,0 +1,80 @@
+import asyncio
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.cancellation import record_client_disconnect
+
+
+class DisconnectMiddleware:
+    """
+    Middleware cancelling a request's handler when its client disconnects.
+
+    The handler runs in its own task while the middleware keeps reading
+    from the connection. If the client goes away before the response is
+    sent, the task is cancelled, which also cancels the asyncpg query
+    it is waiting for and returns the connection to the pool.
+
+    Note:
+        This middleware should be registered using `app.add_middleware(DisconnectMiddleware)`.
+    """
+
+    def __init__(self, app: ASGIApp):
+        """
+        Initializes the DisconnectMiddleware.
+
+        Args:
+            app: The ASGI application.
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        messages: asyncio.Queue[Message] = asyncio.Queue()
+        response_started = False
+        response_complete = False
+
+        async def send_wrapper(message: Message):
+            nonlocal response_started, response_complete
+            await send(message)
+            if message["type"] == "http.response.start":
+                response_started = True
+            elif message["type"] == "http.response.body" and not message.get(
+                "more_body", False
+            ):
+                response_complete = True
+
+        async def watch():
+            # Forward every message to the handler, so it still reads its
+            # body and sees the disconnect itself when streaming.
+            while True:
+                message = await receive()
+                messages.put_nowait(message)
+                if message["type"] == "http.disconnect":
+                    return
+
+        handler = asyncio.create_task(self.app(scope, messages.get, send_wrapper))
+        watcher = asyncio.create_task(watch())
+        try:
+            await asyncio.wait({handler, watcher}, return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            handler.cancel()
+            watcher.cancel()
+            raise
+
+        if handler.done() or response_complete:
+            # Work after the response, e.g. background tasks, is left to finish.
+            watcher.cancel()
+            await handler
+            return
+
+        handler.cancel()
+        try:
+            await handler
+        except asyncio.CancelledError:
+            # Closed event streams end here too; only count requests that
+            # were abandoned while waiting for their response.
+            if not response_started:
+                record_client_disconnect(scope["method"], scope["path"])
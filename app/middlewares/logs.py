@@ -1,6 +1,7 @@
 from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
 from app.utils.logging_configs import logger
+from app.utils.startup import mark_first_request
 
 
 class LogsMiddleware(BaseHTTPMiddleware):
@@ -49,4 +50,5 @@ class LogsMiddleware(BaseHTTPMiddleware):
         logger.info(f"Received request: {request.method} {request.url}")
         response = await call_next(request)
         logger.info(f"Completed response: {response.status_code}")
+        mark_first_request()
         return response
@@ -0,0 +1,56 @@
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.utils.snapshot import snapshot_store
+
+
+class SnapshotMiddleware:
+    """
+    Middleware answering catalog reads from the published snapshot.
+
+    GET requests without a query string whose path is covered by the
+    snapshot are answered from the memory-mapped file, without a database
+    session or serialization. Everything else is passed on unchanged.
+
+    Note:
+        This middleware should be registered using `app.add_middleware(SnapshotMiddleware)`.
+    """
+
+    def __init__(self, app: ASGIApp):
+        """
+        Initializes the SnapshotMiddleware.
+
+        Args:
+            app: The ASGI application.
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (
+            scope["type"] == "http"
+            and scope["method"] == "GET"
+            and not scope["query_string"]
+        ):
+            headers = Headers(scope=scope)
+            found = snapshot_store.get(
+                scope["path"], "gzip" in headers.get("accept-encoding", "")
+            )
+            if found is not None:
+                body, compressed = found
+                response_headers = {
+                    "ETag": f'"{snapshot_store.version}"',
+                    "Vary": "Accept-Encoding",
+                }
+                if headers.get("if-none-match") == response_headers["ETag"]:
+                    response = Response(status_code=304, headers=response_headers)
+                else:
+                    if compressed:
+                        response_headers["Content-Encoding"] = "gzip"
+                    response = Response(
+                        body, media_type="application/json", headers=response_headers
+                    )
+                await response(scope, receive, send)
+                return
+
+        await self.app(scope, receive, send)
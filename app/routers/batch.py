@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends, Request
+from app.db.connection import AsyncSession, get_async_session
+from app.schemas.batch import BatchRequestSchema, BatchResponseSchema
+from app.routers.subjects import router as subjects_router
+from app.routers.topics import router as topics_router
+from app.services.batch import batch_service, get_batch_routes
+
+router = APIRouter(tags=["Batch"], prefix="/api/batch")
+
+# The subject and topic CRUD endpoints, the only ones a batch may call.
+BATCH_ENDPOINTS = {
+    route.endpoint for route in subjects_router.routes + topics_router.routes
+}
+
+
+@router.post("", response_model=BatchResponseSchema)
+async def batch(
+    batch: BatchRequestSchema,
+    request: Request,
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Run several subject and topic requests in one round trip.
+
+    Each operation names a method and a path of the subject or topic routes,
+    e.g. `{"method": "GET", "path": "/api/topics/subject/1?limit=20"}`, and
+    gets back the status and body that route would have returned.
+
+    Args:
+        batch (BatchRequestSchema): The operations and whether to run them atomically.
+        request (Request): The request, giving access to the application's routes.
+        session (AsyncSession): The database session dependency.
+
+    Returns:
+        BatchResponseSchema: The result of each operation.
+    """
+    routes = get_batch_routes(request.app.routes, BATCH_ENDPOINTS)
+    return await batch_service(batch, routes, session)
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, Query
+from app.db.connection import AsyncSession, get_async_session
+from app.schemas.changes import ChangesResponseSchema
+from app.services.changes import get_changes_service
+
+router = APIRouter(tags=["Changes"], prefix="/api/changes")
+
+
+@router.get("", response_model=ChangesResponseSchema)
+async def get_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(1000, ge=1, le=5000),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Retrieve the subjects and topics created, updated or deleted after a cursor.
+
+    Clients start with `since=0`, store the returned `cursor` and pass it on
+    the next call; while `has_more` is true they should call again straight away.
+
+    Args:
+        since (int): The cursor returned by the previous call.
+        limit (int): The maximum number of changes to return.
+        session (AsyncSession): The database session dependency.
+
+    Returns:
+        ChangesResponseSchema: The changes and the next cursor.
+    """
+    return await get_changes_service(since, limit, session)
@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Header
+from fastapi.responses import StreamingResponse
+from app.utils.events import stream_events
+
+router = APIRouter(tags=["Events"], prefix="/api")
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+@router.get("/events")
+async def get_events(last_event_id: int | None = Header(None)):
+    """
+    Stream subject and topic changes as Server-Sent Events.
+
+    Events are named `subject.created`, `subject.updated`, `subject.deleted`,
+    `topic.created`, `topic.updated` and `topic.deleted`. Reconnecting clients
+    send `Last-Event-ID` to receive the changes they missed.
+
+    Args:
+        last_event_id (int | None): The ID of the last event the client received.
+
+    Returns:
+        StreamingResponse: The event stream.
+    """
+    return StreamingResponse(
+        stream_events(None, last_event_id),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+@router.get("/subjects/{subject_id}/events")
+async def get_subject_events(subject_id: int, last_event_id: int | None = Header(None)):
+    """
+    Stream the changes of one subject and its topics as Server-Sent Events.
+
+    Args:
+        subject_id (int): The ID of the subject.
+        last_event_id (int | None): The ID of the last event the client received.
+
+    Returns:
+        StreamingResponse: The event stream.
+    """
+    return StreamingResponse(
+        stream_events(subject_id, last_event_id),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import text
+from app.db.connection import AsyncSession, get_async_session
+from app.utils import cancellation, startup
+
+router = APIRouter(tags=["Health"])
+
+
+@router.get("/healthz")
+async def healthz():
+    """
+    Liveness probe; succeeds as long as the worker is serving requests.
+
+    Returns:
+        dict: The worker status.
+    """
+    return {"status": "ok"}
+
+
+@router.get("/readyz")
+async def readyz(session: AsyncSession = Depends(get_async_session)):
+    """
+    Readiness probe; succeeds once warm-up has finished and the database answers.
+
+    Args:
+        session (AsyncSession): The database session dependency.
+
+    Raises:
+        HTTPException: If the worker is still starting or the database is unavailable.
+
+    Returns:
+        dict: The worker status, start-up timings in seconds and the number of
+            statement timeouts and client disconnects since start.
+    """
+    if startup.ready_seconds is None:
+        raise HTTPException(status_code=503, detail="Starting up")
+
+    try:
+        await session.execute(text("SELECT 1"))
+    except Exception:
+        raise HTTPException(status_code=503, detail="Database unavailable")
+
+    return {
+        "status": "ready",
+        "ready_seconds": startup.ready_seconds,
+        "first_request_seconds": startup.first_request_seconds,
+        "statement_timeouts": cancellation.statement_timeouts,
+        "client_disconnects": cancellation.client_disconnects,
+    }
@@ -4,6 +4,8 @@ from app.schemas.subjects import (
     SubjectCreateEditSchema,
     SubjectResponseSchema,
     SubjectWithTopicsResponseSchema,
+    SubjectBulkDeleteSchema,
+    SubjectBulkDeleteResponseSchema,
 )
 from app.services.subjects import (
     get_list_service,
@@ -11,6 +13,7 @@ from app.services.subjects import (
     create_service,
     edit_service,
     delete_service,
+    bulk_delete_service,
 )
 
 router = APIRouter(tags=["Subjects"], prefix="/api/subjects")
@@ -95,3 +98,21 @@ async def delete(subject_id: int, session: AsyncSession = Depends(get_async_sess
         None
     """
     return await delete_service(subject_id, session)
+
+
+@router.post("/bulk-delete", response_model=SubjectBulkDeleteResponseSchema)
+async def bulk_delete(
+    subjects: SubjectBulkDeleteSchema,
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Delete several subjects by their IDs.
+
+    Args:
+        subjects (SubjectBulkDeleteSchema): The IDs of the subjects to delete.
+        session (AsyncSession): The database session dependency.
+
+    Returns:
+        SubjectBulkDeleteResponseSchema: The IDs of the subjects that were deleted.
+    """
+    return await bulk_delete_service(subjects, session)
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from app.db.connection import AsyncSession, get_async_session
 from app.schemas.topics import (
     TopicCreateEditSchema,
+    TopicPageResponseSchema,
     TopicResponseSchema,
 )
 from app.services.topics import (
@@ -12,6 +13,7 @@ from app.services.topics import (
     edit_service,
     delete_service,
 )
+from config import settings
 
 router = APIRouter(tags=["Topics"], prefix="/api/topics")
 
@@ -45,21 +47,29 @@ async def get_one(topic_id: int, session: AsyncSession = Depends(get_async_sessi
     return await get_one_service(topic_id, session)
 
 
-@router.get("/subject/{subject_id}", response_model=list[TopicResponseSchema])
+@router.get("/subject/{subject_id}", response_model=TopicPageResponseSchema)
 async def get_by_subject(
-    subject_id: int, session: AsyncSession = Depends(get_async_session)
+    subject_id: int,
+    cursor: int = Query(0, ge=0),
+    limit: int = Query(settings.TOPICS_PAGE_SIZE, ge=1, le=1000),
+    session: AsyncSession = Depends(get_async_session),
 ):
     """
-    Retrieve a list of topics associated with a specific subject ID.
+    Retrieve one page of the topics associated with a specific subject ID.
+
+    Topics are ordered by ID. Pass the returned `next_cursor` as `cursor`
+    to read the next page until it is null.
 
     Args:
         subject_id (int): The ID of the subject.
+        cursor (int): The cursor returned by the previous page, 0 for the first page.
+        limit (int): The maximum number of topics to return.
         session (AsyncSession): The database session dependency.
 
     Returns:
-        List[TopicResponseSchema]: A list of topics associated with the subject.
+        TopicPageResponseSchema: The topics and the cursor of the next page.
     """
-    return await get_by_subject_service(subject_id, session)
+    return await get_by_subject_service(subject_id, cursor, limit, session)
 
 
 @router.post("/create", response_model=TopicResponseSchema)
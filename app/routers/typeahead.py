@@ -0,0 +1,35 @@
+from fastapi import APIRouter, HTTPException, Query
+from app.schemas.typeahead import TypeaheadResponseSchema
+from app.utils.typeahead import load_typeahead_index, typeahead_index
+from config import settings
+
+router = APIRouter(tags=["Typeahead"], prefix="/api/typeahead")
+
+
+@router.get("", response_model=list[TypeaheadResponseSchema])
+async def typeahead(
+    prefix: str = Query(..., min_length=1, max_length=255),
+    limit: int = Query(10, ge=1, le=50),
+):
+    """
+    Retrieve subjects and topics whose title starts with a prefix.
+
+    Matches are served from an in-memory index without a database round trip;
+    case, accents and repeated whitespace are ignored.
+
+    Args:
+        prefix (str): The text typed so far.
+        limit (int): The maximum number of matches.
+
+    Raises:
+        HTTPException: If typeahead is disabled or the index could not be loaded.
+
+    Returns:
+        List[TypeaheadResponseSchema]: The matches in alphabetical order.
+    """
+    if not settings.TYPEAHEAD_ENABLED:
+        raise HTTPException(status_code=404, detail="Typeahead is disabled")
+    if not typeahead_index.loaded and not await load_typeahead_index():
+        raise HTTPException(status_code=503, detail="Typeahead index is not ready")
+
+    return typeahead_index.search(prefix, limit)
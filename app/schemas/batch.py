@@ -0,0 +1,58 @@
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field
+
+
+class BatchOperationSchema(BaseModel):
+    """
+    Schema for one sub-request of a batch.
+
+    Attributes:
+        method (str): The HTTP method of the sub-request.
+        path (str): The path of a subject or topic route, with an optional query string.
+        body (dict | None): The JSON body for create and edit routes.
+    """
+
+    method: Literal["GET", "POST", "PUT", "DELETE"]
+    path: str
+    body: dict | None = None
+
+
+class BatchRequestSchema(BaseModel):
+    """
+    Schema for a batch of sub-requests.
+
+    Attributes:
+        operations (list[BatchOperationSchema]): The sub-requests, run in order.
+        atomic (bool): Run all sub-requests in one transaction and roll it back if one fails.
+    """
+
+    operations: list[BatchOperationSchema] = Field(..., min_length=1, max_length=50)
+    atomic: bool = False
+
+
+class BatchResultSchema(BaseModel):
+    """
+    Schema for the result of one sub-request.
+
+    Attributes:
+        status (int): The HTTP status the route would have returned.
+        body (Any): The response body the route would have returned.
+    """
+
+    status: int
+    body: Any
+
+
+class BatchResponseSchema(BaseModel):
+    """
+    Schema for the response of a batch.
+
+    Attributes:
+        results (list[BatchResultSchema]): One result per sub-request that was run. An atomic
+            batch stops at the first failure.
+        rolled_back (bool): Whether an atomic batch was rolled back.
+    """
+
+    results: list[BatchResultSchema]
+    rolled_back: bool
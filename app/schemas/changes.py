@@ -0,0 +1,37 @@
+from pydantic import BaseModel, Field
+from app.schemas.subjects import SubjectResponseSchema
+from app.schemas.topics import TopicResponseSchema
+
+
+class TombstoneResponseSchema(BaseModel):
+    """
+    Schema for a deleted record in the change feed.
+
+    Attributes:
+        entity (str): The kind of deleted record, "subject" or "topic".
+        id (int): The ID of the deleted record.
+        subject_id (int | None): The subject the record belonged to; for subjects, their own ID.
+    """
+
+    entity: str
+    id: int = Field(validation_alias="entity_id")
+    subject_id: int | None
+
+
+class ChangesResponseSchema(BaseModel):
+    """
+    Schema for a page of the change feed.
+
+    Attributes:
+        cursor (int): The value to pass as `since` to fetch the next page.
+        has_more (bool): Whether more changes are available after the cursor.
+        subjects (list[SubjectResponseSchema]): Subjects created or updated since the previous cursor.
+        topics (list[TopicResponseSchema]): Topics created or updated since the previous cursor.
+        deleted (list[TombstoneResponseSchema]): Records deleted since the previous cursor.
+    """
+
+    cursor: int
+    has_more: bool
+    subjects: list[SubjectResponseSchema]
+    topics: list[TopicResponseSchema]
+    deleted: list[TombstoneResponseSchema]
@@ -42,12 +42,37 @@ class SubjectResponseSchema(SubjectBaseSchema):
 
 class SubjectWithTopicsResponseSchema(SubjectBaseSchema):
     """
-    Schema for the response of a subject, including associated topics.
+    Schema for the response of a subject, including its first topics.
 
     Attributes:
         id (int): The unique identifier of the subject.
-        topics (list[TopicResponseSchema]): A list of topics associated with the subject.
+        topics (list[TopicResponseSchema]): The first topics of the subject, ordered by ID.
+        topics_cursor (int | None): The cursor for `/api/topics/subject/{id}` to read the
+            remaining topics, or None if all topics are included.
     """
 
     id: int
     topics: list[TopicResponseSchema]
+    topics_cursor: int | None = None
+
+
+class SubjectBulkDeleteSchema(BaseModel):
+    """
+    Schema for deleting several subjects at once.
+
+    Attributes:
+        ids (list[int]): The IDs of the subjects to delete.
+    """
+
+    ids: list[int] = Field(..., min_length=1, max_length=1000)
+
+
+class SubjectBulkDeleteResponseSchema(BaseModel):
+    """
+    Schema for the response of a bulk subject deletion.
+
+    Attributes:
+        deleted (list[int]): The IDs of the subjects that were deleted.
+    """
+
+    deleted: list[int]
@@ -43,3 +43,16 @@ class TopicResponseSchema(TopicBaseSchema):
     """
 
     id: int
+
+
+class TopicPageResponseSchema(BaseModel):
+    """
+    Schema for one page of a subject's topics.
+
+    Attributes:
+        topics (list[TopicResponseSchema]): The topics of the page, ordered by ID.
+        next_cursor (int | None): The cursor of the next page, or None on the last page.
+    """
+
+    topics: list[TopicResponseSchema]
+    next_cursor: int | None
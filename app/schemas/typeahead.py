@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+
+
+class TypeaheadResponseSchema(BaseModel):
+    """
+    Schema for a typeahead match.
+
+    Attributes:
+        kind (str): "subject" or "topic".
+        id (int): The ID of the matching record.
+        title (str): The title of the matching record.
+        subject_id (int): The subject of a topic; for subjects, their own ID.
+    """
+
+    kind: str
+    id: int
+    title: str
+    subject_id: int
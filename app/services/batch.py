@@ -0,0 +1,227 @@
+from contextlib import AsyncExitStack
+from types import SimpleNamespace
+from typing import Any, Callable
+from urllib.parse import urlsplit
+
+from fastapi import HTTPException, Request
+from fastapi.dependencies.utils import solve_dependencies
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import APIRoute, serialize_response
+from sqlalchemy.exc import DBAPIError
+from starlette.routing import BaseRoute, Match
+
+from app.db.connection import AsyncSession, engine, get_async_session
+from app.schemas.batch import BatchOperationSchema, BatchRequestSchema
+from app.utils.cancellation import QUERY_CANCELED, record_statement_timeout
+from app.utils.events import notifier
+from app.utils.logging_configs import logger
+from app.utils.typeahead import resync_typeahead_index
+
+# Path prefixes of the routes a batch may call, and the kind of record each changes.
+BATCH_KINDS = {"/api/subjects": "subject", "/api/topics": "topic"}
+
+
+def get_batch_routes(
+    routes: list[BaseRoute], endpoints: set[Callable]
+) -> list[APIRoute]:
+    """
+    Select the routes of the application that a batch may call.
+
+    Routes are picked by endpoint rather than by path, so other routes
+    under the subject and topic prefixes, such as the event streams, are
+    answered with 404 instead of being run.
+
+    Args:
+        routes (list[BaseRoute]): The routes of the application.
+        endpoints (set[Callable]): The endpoints a batch may call.
+
+    Returns:
+        list[APIRoute]: The routes a batch may call, in the application's order.
+    """
+    return [
+        route
+        for route in routes
+        if isinstance(route, APIRoute) and route.endpoint in endpoints
+    ]
+
+
+def get_changed_keys(route: APIRoute, values: dict, result: Any) -> list:
+    """
+    List the records changed by a write, for resyncing the typeahead index.
+
+    The record is named by the route's `<kind>_id` path parameter, by the
+    `id` of the returned row for creates, or by the returned `deleted` IDs
+    for bulk deletes.
+
+    Args:
+        route (APIRoute): The route that was called.
+        values (dict): The validated parameters of the call.
+        result (Any): What the route returned.
+
+    Returns:
+        list[tuple[str, int]]: The (kind, id) records changed; empty for reads.
+    """
+    if route.methods <= {"GET", "HEAD"}:
+        return []
+    kind = next(
+        kind for prefix, kind in BATCH_KINDS.items() if route.path.startswith(prefix)
+    )
+    if f"{kind}_id" in values:
+        return [(kind, values[f"{kind}_id"])]
+    if hasattr(result, "id"):
+        return [(kind, result.id)]
+    return [(kind, id) for id in result.get("deleted", ())]
+
+
+async def run_operation(
+    operation: BatchOperationSchema,
+    routes: list[APIRoute],
+    session: AsyncSession,
+    keys: list,
+) -> dict:
+    """
+    Run one sub-request through the matching route of the application.
+
+    Parameters and body are validated as the route validates them, and the
+    route's endpoint is called with the batch's session. Errors the route
+    would turn into a response, such as a missing record, an invalid body
+    or a failed query, become the result of the sub-request.
+
+    Args:
+        operation (BatchOperationSchema): The sub-request.
+        routes (list[APIRoute]): The routes a batch may call.
+        session (AsyncSession): The session shared by the batch.
+        keys (list): Receives the (kind, id) records changed by writes.
+
+    Returns:
+        dict: The status and body of the sub-request.
+    """
+    url = urlsplit(operation.path)
+    scope = {
+        "type": "http",
+        "method": operation.method,
+        "path": url.path,
+        "query_string": url.query.encode(),
+        "headers": [],
+    }
+    path_found = False
+    for route in routes:
+        match, child_scope = route.matches(scope)
+        if match == Match.FULL:
+            break
+        path_found = path_found or match == Match.PARTIAL
+    else:
+        if path_found:
+            return {"status": 405, "body": {"detail": "Method Not Allowed"}}
+        return {"status": 404, "body": {"detail": "Not Found"}}
+
+    request = Request({**scope, **child_scope})
+    overrides = SimpleNamespace(
+        dependency_overrides={get_async_session: lambda: session}
+    )
+    try:
+        async with AsyncExitStack() as async_exit_stack:
+            values, errors, *_ = await solve_dependencies(
+                request=request,
+                dependant=route.dependant,
+                body=operation.body,
+                dependency_overrides_provider=overrides,
+                async_exit_stack=async_exit_stack,
+            )
+            if errors:
+                return {"status": 422, "body": {"detail": jsonable_encoder(errors)}}
+            result = await route.endpoint(**values)
+    except HTTPException as exc:
+        return {"status": exc.status_code, "body": {"detail": exc.detail}}
+    except DBAPIError as exc:
+        # The failed statement aborted the session's transaction; the next
+        # sub-request needs a new one.
+        await session.rollback()
+        if getattr(exc.orig, "sqlstate", None) == QUERY_CANCELED:
+            record_statement_timeout(operation.method, route.path)
+            return {"status": 503, "body": {"detail": "Query timed out"}}
+        logger.error(
+            f"Batch operation failed: {operation.method} {route.path}: {exc.orig!r}"
+        )
+        return {"status": 500, "body": {"detail": "Internal Server Error"}}
+
+    keys.extend(get_changed_keys(route, values, result))
+    body = await serialize_response(
+        field=route.response_field,
+        response_content=result,
+        include=route.response_model_include,
+        exclude=route.response_model_exclude,
+        by_alias=route.response_model_by_alias,
+        exclude_unset=route.response_model_exclude_unset,
+        exclude_defaults=route.response_model_exclude_defaults,
+        exclude_none=route.response_model_exclude_none,
+    )
+    return {"status": route.status_code or 200, "body": body}
+
+
+async def batch_service(
+    batch: BatchRequestSchema, routes: list[APIRoute], session: AsyncSession
+):
+    """
+    Run a batch of sub-requests against the subject and topic routes.
+
+    Sub-requests run in order on one session, so the whole batch uses a
+    single connection. Without `atomic`, every write commits on its own and
+    a failed sub-request, even one failing in the database, does not stop
+    the batch. With `atomic`, the batch
+    runs in one transaction: the services commit to savepoints, and the
+    first failure rolls everything back. Its writes are never coalesced
+    with other requests.
+
+    Args:
+        batch (BatchRequestSchema): The sub-requests.
+        routes (list[APIRoute]): The routes a batch may call.
+        session (AsyncSession): The database session.
+
+    Returns:
+        dict: The result of each sub-request and whether the batch was rolled back.
+    """
+    if not batch.atomic:
+        keys = []
+        results = [
+            await run_operation(operation, routes, session, keys)
+            for operation in batch.operations
+        ]
+        return {"results": results, "rolled_back": False}
+
+    results = []
+    keys = []
+    committed = False
+    try:
+        async with engine.connect() as connection:
+            transaction = await connection.begin()
+            atomic_session = AsyncSession(
+                bind=connection,
+                join_transaction_mode="create_savepoint",
+                expire_on_commit=False,
+                info={**session.info, "atomic": True},
+            )
+            try:
+                for operation in batch.operations:
+                    result = await run_operation(
+                        operation, routes, atomic_session, keys
+                    )
+                    results.append(result)
+                    if result["status"] >= 400:
+                        break
+                else:
+                    await transaction.commit()
+                    committed = True
+            finally:
+                await atomic_session.close()
+                if not committed:
+                    await transaction.rollback()
+    finally:
+        if not committed:
+            # The services updated the typeahead index as if their writes
+            # were committed; put back what the database still holds.
+            await resync_typeahead_index(keys, session)
+
+    if committed:
+        notifier.wake()
+    return {"results": results, "rolled_back": not committed}
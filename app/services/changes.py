@@ -0,0 +1,108 @@
+import heapq
+
+from app.db.connection import AsyncSession
+from app.db.models import SubjectModel, TopicModel, TombstoneModel
+from sqlalchemy import select, lambda_stmt, text
+
+# Sequence numbers start with the writing transaction's ID (see the change
+# feed horizon migration), so none below the oldest running transaction
+# can still be committed.
+CHANGE_HORIZON = text(
+    "SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint << 24"
+)
+
+
+async def get_change_horizon(session: AsyncSession) -> int:
+    """
+    Find the sequence number below which the change feed can no longer change.
+
+    Args:
+        session (AsyncSession): The database session.
+
+    Returns:
+        int: The first sequence number a running or future transaction may use.
+    """
+    result = await session.execute(CHANGE_HORIZON)
+    return result.scalar()
+
+
+async def get_change_rows(since: int, limit: int, session: AsyncSession):
+    """
+    Retrieve the changed rows recorded after a cursor, in sequence order.
+
+    Each source is read through its `change_seq` index and the three streams
+    are merged and cut at `limit`. A record changed several times only
+    appears once, with its current state. Rows at or above the change
+    horizon are left for a later call, so a transaction committing after a
+    newer one is never skipped by a cursor that already moved past it.
+
+    Args:
+        since (int): The last sequence number already seen, 0 for everything.
+        limit (int): The maximum number of rows to return.
+        session (AsyncSession): The database session.
+
+    Returns:
+        tuple[list, bool]: The SubjectModel, TopicModel and TombstoneModel rows,
+            and whether more rows are available.
+    """
+    fetch = limit + 1
+    horizon = await get_change_horizon(session)
+    subjects = await session.execute(
+        lambda_stmt(
+            lambda: select(SubjectModel)
+            .where(SubjectModel.change_seq > since, SubjectModel.change_seq < horizon)
+            .order_by(SubjectModel.change_seq)
+            .limit(fetch)
+        )
+    )
+    topics = await session.execute(
+        lambda_stmt(
+            lambda: select(TopicModel)
+            .where(TopicModel.change_seq > since, TopicModel.change_seq < horizon)
+            .order_by(TopicModel.change_seq)
+            .limit(fetch)
+        )
+    )
+    tombstones = await session.execute(
+        lambda_stmt(
+            lambda: select(TombstoneModel)
+            .where(
+                TombstoneModel.change_seq > since, TombstoneModel.change_seq < horizon
+            )
+            .order_by(TombstoneModel.change_seq)
+            .limit(fetch)
+        )
+    )
+
+    rows = list(
+        heapq.merge(
+            subjects.scalars().all(),
+            topics.scalars().all(),
+            tombstones.scalars().all(),
+            key=lambda row: row.change_seq,
+        )
+    )
+    return rows[:limit], len(rows) > limit
+
+
+async def get_changes_service(since: int, limit: int, session: AsyncSession):
+    """
+    Retrieve the subjects, topics and deletions recorded after a cursor.
+
+    Args:
+        since (int): The cursor returned by the previous call, 0 for a full sync.
+        limit (int): The maximum number of changes to return.
+        session (AsyncSession): The database session.
+
+    Returns:
+        dict: The changes, the next cursor and whether more changes are available.
+    """
+    rows, has_more = await get_change_rows(since, limit, session)
+
+    return {
+        "cursor": rows[-1].change_seq if rows else since,
+        "has_more": has_more,
+        "subjects": [row for row in rows if isinstance(row, SubjectModel)],
+        "topics": [row for row in rows if isinstance(row, TopicModel)],
+        "deleted": [row for row in rows if isinstance(row, TombstoneModel)],
+    }
@@ -1,9 +1,184 @@
 from fastapi import HTTPException
-from app.db.connection import AsyncSession
-from app.db.models import SubjectModel
-from app.schemas.subjects import SubjectCreateEditSchema
-from sqlalchemy import select, insert, update, delete, desc
-from sqlalchemy.orm import selectinload
+from app.db.connection import AsyncSession, fetch_records
+from app.db.models import SubjectModel, TopicModel
+from app.schemas.subjects import SubjectCreateEditSchema, SubjectBulkDeleteSchema
+from app.utils.coalescer import WriteCoalescer, should_coalesce, split_rounds
+from app.utils.events import notifier
+from app.utils.typeahead import typeahead_index
+from sqlalchemy import (
+    ARRAY,
+    Integer,
+    String,
+    any_,
+    func,
+    select,
+    insert,
+    update,
+    delete,
+    desc,
+    bindparam,
+    lambda_stmt,
+)
+from config import settings
+
+# Write statements are built once at import time and executed with bound
+# parameters, so every request reuses the same compiled SQL and asyncpg
+# prepared statement instead of rebuilding the construct from scratch.
+INSERT_SUBJECT = (
+    insert(SubjectModel).values(title=bindparam("title")).returning(SubjectModel)
+)
+UPDATE_SUBJECT = (
+    update(SubjectModel)
+    .values(title=bindparam("title"))
+    .where(SubjectModel.id == bindparam("subject_id"))
+    .returning(SubjectModel)
+    .execution_options(synchronize_session=False)
+)
+DELETE_SUBJECT = (
+    delete(SubjectModel)
+    .where(SubjectModel.id == bindparam("subject_id"))
+    .execution_options(synchronize_session=False)
+)
+# `id = ANY(:ids)` keeps a single prepared statement for any number of ids.
+BULK_DELETE_SUBJECTS = (
+    delete(SubjectModel)
+    .where(SubjectModel.id == any_(bindparam("ids", type_=ARRAY(Integer))))
+    .returning(SubjectModel.id)
+    .execution_options(synchronize_session=False)
+)
+
+# Group statements for coalesced writes (`WRITE_COALESCING_ENABLED`). The
+# insert is executed with one parameter set per row and sent as a single
+# multi-row INSERT, whose rows come back in no particular order and are
+# matched to their callers by title; the update joins the target rows to
+# arrays of new values.
+SELECT_SUBJECT_TITLES = select(SubjectModel.title).where(
+    SubjectModel.title == any_(bindparam("titles", type_=ARRAY(String)))
+)
+INSERT_SUBJECTS = insert(SubjectModel).returning(SubjectModel)
+SUBJECT_EDITS = (
+    func.unnest(
+        bindparam("ids", type_=ARRAY(Integer)),
+        bindparam("titles", type_=ARRAY(String)),
+    )
+    .table_valued("id", "title")
+    .render_derived()
+)
+UPDATE_SUBJECTS = (
+    update(SubjectModel)
+    .values(title=SUBJECT_EDITS.c.title)
+    .where(SubjectModel.id == SUBJECT_EDITS.c.id)
+    .returning(SubjectModel)
+    .execution_options(synchronize_session=False)
+)
+
+# Plain SQL for the ORM-free read path (`DB_READ_PATH=raw`).
+RAW_SELECT_SUBJECTS = (
+    "SELECT id, title, created_at, updated_at FROM subjects ORDER BY id DESC"
+)
+RAW_SELECT_SUBJECT = (
+    "SELECT id, title, created_at, updated_at FROM subjects WHERE id = $1"
+)
+RAW_SELECT_TOPIC_PAGE = (
+    "SELECT id, title, description, subject_id, created_at, updated_at "
+    "FROM topics WHERE subject_id = $1 AND id > $2 ORDER BY id LIMIT $3"
+)
+
+
+def select_subject_by_id(subject_id: int):
+    """
+    Build a cached statement selecting a subject by its ID.
+
+    Args:
+        subject_id (int): The ID of the subject.
+
+    Returns:
+        StatementLambdaElement: The cached select statement.
+    """
+    return lambda_stmt(
+        lambda: select(SubjectModel).where(SubjectModel.id == subject_id)
+    )
+
+
+def select_topic_page(subject_id: int, cursor: int, fetch: int):
+    """
+    Build a cached statement selecting a subject's topics after a cursor.
+
+    The statement walks the `(subject_id, id)` index in order and stops
+    after `fetch` rows, so its cost does not depend on the subject's size.
+
+    Args:
+        subject_id (int): The ID of the subject.
+        cursor (int): The last topic ID already returned, 0 for the first page.
+        fetch (int): The maximum number of rows to read.
+
+    Returns:
+        StatementLambdaElement: The cached select statement.
+    """
+    return lambda_stmt(
+        lambda: select(TopicModel)
+        .where(TopicModel.subject_id == subject_id, TopicModel.id > cursor)
+        .order_by(TopicModel.id)
+        .limit(fetch)
+    )
+
+
+async def get_topic_page(
+    subject_id: int, cursor: int, limit: int, session: AsyncSession
+):
+    """
+    Retrieve one page of a subject's topics, ordered by ascending ID.
+
+    Args:
+        subject_id (int): The ID of the subject.
+        cursor (int): The last topic ID already returned, 0 for the first page.
+        limit (int): The maximum number of topics to return.
+        session (AsyncSession): The database session.
+
+    Returns:
+        tuple[list[TopicModel | dict], int | None]: The topics and the cursor of
+            the next page, None if this is the last page.
+    """
+    if settings.DB_READ_PATH == "raw":
+        topics = await fetch_records(
+            session, RAW_SELECT_TOPIC_PAGE, subject_id, cursor, limit + 1
+        )
+        if len(topics) > limit:
+            return topics[:limit], topics[limit - 1]["id"]
+        return topics, None
+
+    result = await session.execute(select_topic_page(subject_id, cursor, limit + 1))
+    topics = result.scalars().all()
+    if len(topics) > limit:
+        return topics[:limit], topics[limit - 1].id
+    return topics, None
+
+
+async def get_subject_record(subject_id: int, session: AsyncSession) -> dict | None:
+    """
+    Retrieve the columns of a subject as a dictionary.
+
+    Args:
+        subject_id (int): The ID of the subject.
+        session (AsyncSession): The database session.
+
+    Returns:
+        dict | None: The subject, or None if it does not exist.
+    """
+    if settings.DB_READ_PATH == "raw":
+        records = await fetch_records(session, RAW_SELECT_SUBJECT, subject_id)
+        return records[0] if records else None
+
+    result = await session.execute(select_subject_by_id(subject_id))
+    subject = result.scalar()
+    if subject is None:
+        return None
+    return {
+        "id": subject.id,
+        "title": subject.title,
+        "created_at": subject.created_at,
+        "updated_at": subject.updated_at,
+    }
 
 
 async def get_list_service(session: AsyncSession):
@@ -14,16 +189,22 @@ async def get_list_service(session: AsyncSession):
         session (AsyncSession): The database session.
 
     Returns:
-        List[SubjectModel]: A list of subjects.
+        List[SubjectModel | dict]: A list of subjects.
     """
-    query = select(SubjectModel).order_by(desc(SubjectModel.id))
+    if settings.DB_READ_PATH == "raw":
+        return await fetch_records(session, RAW_SELECT_SUBJECTS)
+
+    query = lambda_stmt(lambda: select(SubjectModel).order_by(desc(SubjectModel.id)))
     result = await session.execute(query)
     return result.scalars().all()
 
 
 async def get_one_service(subject_id: int, session: AsyncSession):
     """
-    Retrieve a specific subject by its ID, including its associated topics.
+    Retrieve a specific subject by its ID, including its first topics.
+
+    At most `settings.SUBJECT_TOPICS_LIMIT` topics are embedded; the rest
+    are read from `/api/topics/subject/{subject_id}` starting at `topics_cursor`.
 
     Args:
         subject_id (int): The ID of the subject to retrieve.
@@ -33,26 +214,97 @@ async def get_one_service(subject_id: int, session: AsyncSession):
         HTTPException: If the subject is not found.
 
     Returns:
-        SubjectModel: The subject with its topics.
+        dict: The subject, its first topics and the cursor of the remaining ones.
     """
-    query = select(SubjectModel).where(SubjectModel.id == subject_id)
-    exist = await session.execute(query)
-    if not exist.scalar():
+    subject = await get_subject_record(subject_id, session)
+    if subject is None:
         raise HTTPException(status_code=404, detail="Subject not found!")
 
-    query = (
-        select(SubjectModel)
-        .options(selectinload(SubjectModel.topics))
-        .where(SubjectModel.id == subject_id)
+    topics, topics_cursor = await get_topic_page(
+        subject_id, 0, settings.SUBJECT_TOPICS_LIMIT, session
     )
-    result = await session.execute(query)
-    return result.scalar()
+    return {**subject, "topics": topics, "topics_cursor": topics_cursor}
+
+
+async def create_group(items: list[dict], session: AsyncSession) -> list:
+    """
+    Create a group of subjects with one statement, without committing.
+
+    A title that already exists, or that an earlier item of the group
+    uses, gets the same error as in `create_service`.
+
+    Args:
+        items (list[dict]): The subject data of each create.
+        session (AsyncSession): The database session.
+
+    Returns:
+        list[SubjectModel | HTTPException]: The created subject or the error of each item.
+    """
+    titles = [item["title"] for item in items]
+    result = await session.execute(SELECT_SUBJECT_TITLES, {"titles": titles})
+    taken = set(result.scalars())
+
+    results: list = [None] * len(items)
+    rows = []
+    for index, item in enumerate(items):
+        if item["title"] in taken:
+            results[index] = HTTPException(
+                status_code=400, detail="Subject already exists"
+            )
+            continue
+        taken.add(item["title"])
+        rows.append((index, item))
+
+    if rows:
+        result = await session.execute(INSERT_SUBJECTS, [item for _, item in rows])
+        created = {subject.title: subject for subject in result.scalars()}
+        for index, item in rows:
+            results[index] = created[item["title"]]
+    return results
+
+
+async def edit_group(items: list[dict], session: AsyncSession) -> list:
+    """
+    Edit a group of subjects with one statement per round, without committing.
+
+    Args:
+        items (list[dict]): The subject ID and data of each edit.
+        session (AsyncSession): The database session.
+
+    Returns:
+        list[SubjectModel | HTTPException]: The updated subject or the error of each item.
+    """
+    results: list = [None] * len(items)
+    for entries in split_rounds(items, "subject_id"):
+        # RETURNING would hand back copies the session already holds, from
+        # an earlier round or read, with their old values.
+        session.expunge_all()
+        result = await session.execute(
+            UPDATE_SUBJECTS,
+            {
+                "ids": [item["subject_id"] for _, item in entries],
+                "titles": [item["title"] for _, item in entries],
+            },
+        )
+        updated = {subject.id: subject for subject in result.scalars()}
+        for index, item in entries:
+            results[index] = updated.get(item["subject_id"]) or HTTPException(
+                status_code=404, detail="Subject not found!"
+            )
+    return results
+
+
+create_writes = WriteCoalescer(create_group)
+edit_writes = WriteCoalescer(edit_group)
 
 
 async def create_service(subject: SubjectCreateEditSchema, session: AsyncSession):
     """
     Create a new subject if it does not already exist.
 
+    With write coalescing enabled, the subject is created together with
+    concurrent creates by `create_group`.
+
     Args:
         subject (SubjectCreateEditSchema): The subject data for creation.
         session (AsyncSession): The database session.
@@ -63,15 +315,22 @@ async def create_service(subject: SubjectCreateEditSchema, session: AsyncSession
     Returns:
         SubjectModel: The created subject.
     """
-    query = select(SubjectModel).where(SubjectModel.title == subject.title)
-    exist = await session.execute(query)
-    if exist.scalar() is not None:
-        raise HTTPException(status_code=400, detail="Subject already exists")
+    if should_coalesce(session):
+        created = await create_writes.submit(subject.model_dump(), session)
+    else:
+        title = subject.title
+        query = lambda_stmt(
+            lambda: select(SubjectModel.id).where(SubjectModel.title == title)
+        )
+        exist = await session.execute(query)
+        if exist.scalar() is not None:
+            raise HTTPException(status_code=400, detail="Subject already exists")
 
-    stmt = insert(SubjectModel).values(**subject.model_dump()).returning(SubjectModel)
-    result = await session.execute(stmt)
-    await session.commit()
-    created = result.scalar()
+        result = await session.execute(INSERT_SUBJECT, subject.model_dump())
+        await session.commit()
+        created = result.scalar()
+    notifier.wake()
+    typeahead_index.apply(created)
 
     return created
 
@@ -82,6 +341,9 @@ async def edit_service(
     """
     Edit an existing subject by its ID.
 
+    With write coalescing enabled, the subject is updated together with
+    concurrent edits by `edit_group`.
+
     Args:
         subject_id (int): The ID of the subject to edit.
         subject (SubjectCreateEditSchema): The subject data for updating.
@@ -93,20 +355,27 @@ async def edit_service(
     Returns:
         SubjectModel: The updated subject.
     """
-    query = select(SubjectModel).where(SubjectModel.id == subject_id)
-    exist = await session.execute(query)
-    if not exist.scalar():
-        raise HTTPException(status_code=404, detail="Subject not found!")
-
-    stmt = (
-        update(SubjectModel)
-        .values(**subject.model_dump())
-        .where(SubjectModel.id == subject_id)
-        .returning(SubjectModel)
-    )
-    result = await session.execute(stmt)
-    await session.commit()
-    updated = result.scalar()
+    if should_coalesce(session):
+        updated = await edit_writes.submit(
+            {"subject_id": subject_id, **subject.model_dump()}, session
+        )
+    else:
+        # RETURNING would hand back a copy the session already holds, with
+        # its old values, instead of the updated row.
+        loaded = session.identity_map.get(
+            session.identity_key(SubjectModel, subject_id)
+        )
+        if loaded is not None:
+            session.expunge(loaded)
+        result = await session.execute(
+            UPDATE_SUBJECT, {"subject_id": subject_id, **subject.model_dump()}
+        )
+        updated = result.scalar()
+        if updated is None:
+            raise HTTPException(status_code=404, detail="Subject not found!")
+        await session.commit()
+    notifier.wake()
+    typeahead_index.apply(updated)
 
     return updated
 
@@ -125,12 +394,35 @@ async def delete_service(subject_id: int, session: AsyncSession):
     Returns:
         str: Success message indicating deletion.
     """
-    query = select(SubjectModel).where(SubjectModel.id == subject_id)
-    exist = await session.execute(query)
+    exist = await session.execute(select_subject_by_id(subject_id))
     if not exist.scalar():
         raise HTTPException(status_code=404, detail="Subject not found!")
 
-    stmt = delete(SubjectModel).where(SubjectModel.id == subject_id)
-    await session.execute(stmt)
+    await session.execute(DELETE_SUBJECT, {"subject_id": subject_id})
     await session.commit()
+    notifier.wake()
+    typeahead_index.remove("subject", subject_id)
     return "success"
+
+
+async def bulk_delete_service(subjects: SubjectBulkDeleteSchema, session: AsyncSession):
+    """
+    Delete several subjects in one statement.
+
+    Topics of the deleted subjects are removed by the database through the
+    cascading foreign key; they are never loaded into the session.
+
+    Args:
+        subjects (SubjectBulkDeleteSchema): The IDs of the subjects to delete.
+        session (AsyncSession): The database session.
+
+    Returns:
+        dict: The IDs of the subjects that were deleted.
+    """
+    result = await session.execute(BULK_DELETE_SUBJECTS, {"ids": subjects.ids})
+    await session.commit()
+    notifier.wake()
+    deleted = result.scalars().all()
+    for subject_id in deleted:
+        typeahead_index.remove("subject", subject_id)
+    return {"deleted": deleted}
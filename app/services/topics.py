@@ -1,8 +1,105 @@
 from fastapi import HTTPException
-from app.db.connection import AsyncSession
-from app.db.models import TopicModel, SubjectModel
+from app.db.connection import AsyncSession, fetch_records
+from app.db.models import TopicModel
 from app.schemas.topics import TopicCreateEditSchema
-from sqlalchemy import select, insert, update, delete, desc
+from app.services.subjects import get_subject_record, get_topic_page
+from app.utils.coalescer import WriteCoalescer, should_coalesce, split_rounds
+from app.utils.events import notifier
+from app.utils.typeahead import typeahead_index
+from config import settings
+from sqlalchemy import (
+    ARRAY,
+    Integer,
+    String,
+    Text,
+    any_,
+    func,
+    select,
+    insert,
+    update,
+    delete,
+    desc,
+    bindparam,
+    lambda_stmt,
+)
+
+# Write statements are built once at import time and executed with bound
+# parameters; see app/services/subjects.py.
+INSERT_TOPIC = (
+    insert(TopicModel)
+    .values(
+        title=bindparam("title"),
+        description=bindparam("description"),
+        subject_id=bindparam("subject_id"),
+    )
+    .returning(TopicModel)
+)
+UPDATE_TOPIC = (
+    update(TopicModel)
+    .values(
+        title=bindparam("title"),
+        description=bindparam("description"),
+        subject_id=bindparam("subject_id"),
+    )
+    .where(TopicModel.id == bindparam("topic_id"))
+    .returning(TopicModel)
+    .execution_options(synchronize_session=False)
+)
+DELETE_TOPIC = (
+    delete(TopicModel)
+    .where(TopicModel.id == bindparam("topic_id"))
+    .execution_options(synchronize_session=False)
+)
+
+# Group statements for coalesced writes; see app/services/subjects.py.
+SELECT_TOPIC_TITLES = select(TopicModel.title).where(
+    TopicModel.title == any_(bindparam("titles", type_=ARRAY(String)))
+)
+INSERT_TOPICS = insert(TopicModel).returning(TopicModel)
+TOPIC_EDITS = (
+    func.unnest(
+        bindparam("ids", type_=ARRAY(Integer)),
+        bindparam("titles", type_=ARRAY(String)),
+        bindparam("descriptions", type_=ARRAY(Text)),
+        bindparam("subject_ids", type_=ARRAY(Integer)),
+    )
+    .table_valued("id", "title", "description", "subject_id")
+    .render_derived()
+)
+UPDATE_TOPICS = (
+    update(TopicModel)
+    .values(
+        title=TOPIC_EDITS.c.title,
+        description=TOPIC_EDITS.c.description,
+        subject_id=TOPIC_EDITS.c.subject_id,
+    )
+    .where(TopicModel.id == TOPIC_EDITS.c.id)
+    .returning(TopicModel)
+    .execution_options(synchronize_session=False)
+)
+
+# Plain SQL for the ORM-free read path (`DB_READ_PATH=raw`).
+RAW_SELECT_TOPICS = (
+    "SELECT id, title, description, subject_id, created_at, updated_at "
+    "FROM topics ORDER BY id DESC"
+)
+RAW_SELECT_TOPIC = (
+    "SELECT id, title, description, subject_id, created_at, updated_at "
+    "FROM topics WHERE id = $1"
+)
+
+
+def select_topic_by_id(topic_id: int):
+    """
+    Build a cached statement selecting a topic by its ID.
+
+    Args:
+        topic_id (int): The ID of the topic.
+
+    Returns:
+        StatementLambdaElement: The cached select statement.
+    """
+    return lambda_stmt(lambda: select(TopicModel).where(TopicModel.id == topic_id))
 
 
 async def get_list_service(session: AsyncSession):
@@ -13,9 +110,12 @@ async def get_list_service(session: AsyncSession):
         session (AsyncSession): The database session.
 
     Returns:
-        List[TopicModel]: A list of topics.
+        List[TopicModel | dict]: A list of topics.
     """
-    query = select(TopicModel).order_by(desc(TopicModel.id))
+    if settings.DB_READ_PATH == "raw":
+        return await fetch_records(session, RAW_SELECT_TOPICS)
+
+    query = lambda_stmt(lambda: select(TopicModel).order_by(desc(TopicModel.id)))
     result = await session.execute(query)
     return result.scalars().all()
 
@@ -32,46 +132,130 @@ async def get_one_service(topic_id: int, session: AsyncSession):
         HTTPException: If the topic is not found.
 
     Returns:
-        TopicModel: The retrieved topic.
+        TopicModel | dict: The retrieved topic.
     """
-    query = select(TopicModel).where(TopicModel.id == topic_id)
-    exist = await session.execute(query)
-    if not exist.scalar():
+    if settings.DB_READ_PATH == "raw":
+        records = await fetch_records(session, RAW_SELECT_TOPIC, topic_id)
+        topic = records[0] if records else None
+    else:
+        result = await session.execute(select_topic_by_id(topic_id))
+        topic = result.scalar()
+    if not topic:
         raise HTTPException(status_code=404, detail="Topic not found!")
 
-    query = select(TopicModel).where(TopicModel.id == topic_id)
-    result = await session.execute(query)
-    return result.scalar()
+    return topic
 
 
-async def get_by_subject_service(subject_id: int, session: AsyncSession):
+async def get_by_subject_service(
+    subject_id: int, cursor: int, limit: int, session: AsyncSession
+):
     """
-    Retrieve a list of topics associated with a specific subject ID.
+    Retrieve one page of the topics associated with a specific subject ID.
+
+    Topics are ordered by ascending ID. The subject is only looked up when
+    the page is empty, since a topic cannot exist without its subject.
 
     Args:
         subject_id (int): The ID of the subject.
+        cursor (int): The `next_cursor` of the previous page, 0 for the first page.
+        limit (int): The maximum number of topics to return.
         session (AsyncSession): The database session.
 
     Raises:
         HTTPException: If the subject is not found.
 
     Returns:
-        List[TopicModel]: A list of topics associated with the subject.
+        dict: The topics and the cursor of the next page.
     """
-    query = select(SubjectModel).where(SubjectModel.id == subject_id)
-    exist = await session.execute(query)
-    if not exist.scalar():
-        raise HTTPException(status_code=404, detail="Subject not found!")
+    topics, next_cursor = await get_topic_page(subject_id, cursor, limit, session)
+    if not topics:
+        if await get_subject_record(subject_id, session) is None:
+            raise HTTPException(status_code=404, detail="Subject not found!")
 
-    query = select(TopicModel).where(TopicModel.subject_id == subject_id)
-    result = await session.execute(query)
-    return result.scalars().all()
+    return {"topics": topics, "next_cursor": next_cursor}
+
+
+async def create_group(items: list[dict], session: AsyncSession) -> list:
+    """
+    Create a group of topics with one statement, without committing.
+
+    A title that already exists, or that an earlier item of the group
+    uses, gets the same error as in `create_service`.
+
+    Args:
+        items (list[dict]): The topic data of each create.
+        session (AsyncSession): The database session.
+
+    Returns:
+        list[TopicModel | HTTPException]: The created topic or the error of each item.
+    """
+    titles = [item["title"] for item in items]
+    result = await session.execute(SELECT_TOPIC_TITLES, {"titles": titles})
+    taken = set(result.scalars())
+
+    results: list = [None] * len(items)
+    rows = []
+    for index, item in enumerate(items):
+        if item["title"] in taken:
+            results[index] = HTTPException(
+                status_code=400, detail="Topic already exists"
+            )
+            continue
+        taken.add(item["title"])
+        rows.append((index, item))
+
+    if rows:
+        result = await session.execute(INSERT_TOPICS, [item for _, item in rows])
+        created = {topic.title: topic for topic in result.scalars()}
+        for index, item in rows:
+            results[index] = created[item["title"]]
+    return results
+
+
+async def edit_group(items: list[dict], session: AsyncSession) -> list:
+    """
+    Edit a group of topics with one statement per round, without committing.
+
+    Args:
+        items (list[dict]): The topic ID and data of each edit.
+        session (AsyncSession): The database session.
+
+    Returns:
+        list[TopicModel | HTTPException]: The updated topic or the error of each item.
+    """
+    results: list = [None] * len(items)
+    for entries in split_rounds(items, "topic_id"):
+        # RETURNING would hand back copies the session already holds, from
+        # an earlier round or read, with their old values.
+        session.expunge_all()
+        result = await session.execute(
+            UPDATE_TOPICS,
+            {
+                "ids": [item["topic_id"] for _, item in entries],
+                "titles": [item["title"] for _, item in entries],
+                "descriptions": [item["description"] for _, item in entries],
+                "subject_ids": [item["subject_id"] for _, item in entries],
+            },
+        )
+        updated = {topic.id: topic for topic in result.scalars()}
+        for index, item in entries:
+            results[index] = updated.get(item["topic_id"]) or HTTPException(
+                status_code=404, detail="Topic not found!"
+            )
+    return results
+
+
+create_writes = WriteCoalescer(create_group)
+edit_writes = WriteCoalescer(edit_group)
 
 
 async def create_service(topic: TopicCreateEditSchema, session: AsyncSession):
     """
     Create a new topic if it does not already exist.
 
+    With write coalescing enabled, the topic is created together with
+    concurrent creates by `create_group`.
+
     Args:
         topic (TopicCreateEditSchema): The topic data for creation.
         session (AsyncSession): The database session.
@@ -82,15 +266,22 @@ async def create_service(topic: TopicCreateEditSchema, session: AsyncSession):
     Returns:
         TopicModel: The created topic.
     """
-    query = select(TopicModel).where(TopicModel.title == topic.title)
-    exist = await session.execute(query)
-    if exist.scalar() is not None:
-        raise HTTPException(status_code=400, detail="Topic already exists")
-
-    stmt = insert(TopicModel).values(**topic.model_dump()).returning(TopicModel)
-    result = await session.execute(stmt)
-    await session.commit()
-    created = result.scalar()
+    if should_coalesce(session):
+        created = await create_writes.submit(topic.model_dump(), session)
+    else:
+        title = topic.title
+        query = lambda_stmt(
+            lambda: select(TopicModel.id).where(TopicModel.title == title)
+        )
+        exist = await session.execute(query)
+        if exist.scalar() is not None:
+            raise HTTPException(status_code=400, detail="Topic already exists")
+
+        result = await session.execute(INSERT_TOPIC, topic.model_dump())
+        await session.commit()
+        created = result.scalar()
+    notifier.wake()
+    typeahead_index.apply(created)
 
     return created
 
@@ -101,6 +292,9 @@ async def edit_service(
     """
     Edit an existing topic by its ID.
 
+    With write coalescing enabled, the topic is updated together with
+    concurrent edits by `edit_group`.
+
     Args:
         topic_id (int): The ID of the topic to edit.
         topic (TopicCreateEditSchema): The topic data for updating.
@@ -112,20 +306,25 @@ async def edit_service(
     Returns:
         TopicModel: The updated topic.
     """
-    query = select(TopicModel).where(TopicModel.id == topic_id)
-    exist = await session.execute(query)
-    if not exist.scalar():
-        raise HTTPException(status_code=404, detail="Topic not found!")
-
-    stmt = (
-        update(TopicModel)
-        .values(**topic.model_dump())
-        .where(TopicModel.id == topic_id)
-        .returning(TopicModel)
-    )
-    result = await session.execute(stmt)
-    await session.commit()
-    updated = result.scalar()
+    if should_coalesce(session):
+        updated = await edit_writes.submit(
+            {"topic_id": topic_id, **topic.model_dump()}, session
+        )
+    else:
+        # RETURNING would hand back a copy the session already holds, with
+        # its old values, instead of the updated row.
+        loaded = session.identity_map.get(session.identity_key(TopicModel, topic_id))
+        if loaded is not None:
+            session.expunge(loaded)
+        result = await session.execute(
+            UPDATE_TOPIC, {"topic_id": topic_id, **topic.model_dump()}
+        )
+        updated = result.scalar()
+        if updated is None:
+            raise HTTPException(status_code=404, detail="Topic not found!")
+        await session.commit()
+    notifier.wake()
+    typeahead_index.apply(updated)
 
     return updated
 
@@ -144,12 +343,12 @@ async def delete_service(topic_id: int, session: AsyncSession):
     Returns:
         str: Success message indicating deletion.
     """
-    query = select(TopicModel).where(TopicModel.id == topic_id)
-    exist = await session.execute(query)
+    exist = await session.execute(select_topic_by_id(topic_id))
     if not exist.scalar():
         raise HTTPException(status_code=404, detail="Topic not found!")
 
-    stmt = delete(TopicModel).where(TopicModel.id == topic_id)
-    await session.execute(stmt)
+    await session.execute(DELETE_TOPIC, {"topic_id": topic_id})
     await session.commit()
+    notifier.wake()
+    typeahead_index.remove("topic", topic_id)
     return "success"
@@ -0,0 +1,61 @@
+from fastapi import FastAPI
+from starlette.applications import Starlette
+from starlette.types import Receive, Scope, Send
+
+from config import settings
+
+
+class LazyAdmin:
+    """
+    ASGI application that builds the admin interface on first access.
+
+    SQLAdmin and its templates are only imported when the first request
+    reaches `/admin`, which keeps them out of the worker start-up path.
+
+    Attributes:
+        routes (list): Routes of the admin interface, used by `url_for`.
+    """
+
+    def __init__(self):
+        """
+        Initializes the LazyAdmin without loading SQLAdmin.
+        """
+        self._app = None
+
+    @property
+    def routes(self) -> list:
+        """
+        Routes of the loaded admin interface, or an empty list before first access.
+        """
+        return self._app.routes if self._app is not None else []
+
+    def load(self) -> Starlette:
+        """
+        Build the admin interface if it has not been built yet.
+
+        Returns:
+            Starlette: The admin ASGI application.
+        """
+        if self._app is None:
+            from app.utils.sqladmin_configs import create_admin
+
+            self._app = create_admin(Starlette()).admin
+        return self._app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        await self.load()(scope, receive, send)
+
+
+def mount_admin(app: FastAPI):
+    """
+    Mount the admin interface according to `settings.ADMIN_MODE`.
+
+    Args:
+        app (FastAPI): The application to mount the admin interface on.
+    """
+    if settings.ADMIN_MODE == "eager":
+        from app.utils.sqladmin_configs import create_admin
+
+        create_admin(app)
+    elif settings.ADMIN_MODE == "lazy":
+        app.mount("/admin", app=LazyAdmin(), name="admin")
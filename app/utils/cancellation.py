@@ -0,0 +1,57 @@
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import DBAPIError
+
+from app.utils.logging_configs import logger
+
+QUERY_CANCELED = "57014"
+
+statement_timeouts = 0
+client_disconnects = 0
+
+
+def record_client_disconnect(method: str, path: str):
+    """
+    Count and log a request abandoned by its client before the response was sent.
+
+    Args:
+        method (str): The request method.
+        path (str): The request path.
+    """
+    global client_disconnects
+    client_disconnects += 1
+    logger.warning(f"Client disconnected, cancelled request: {method} {path}")
+
+
+def record_statement_timeout(method: str, path: str):
+    """
+    Count and log a query cancelled by `statement_timeout`.
+
+    Args:
+        method (str): The request method.
+        path (str): The route path.
+    """
+    global statement_timeouts
+    statement_timeouts += 1
+    logger.warning(f"Statement timeout: {method} {path}")
+
+
+async def statement_timeout_handler(request: Request, exc: DBAPIError):
+    """
+    Turn a query cancelled by `statement_timeout` into a 503 response.
+
+    Other database errors are raised again and reported as before.
+
+    Args:
+        request (Request): The request whose query failed.
+        exc (DBAPIError): The database error.
+
+    Returns:
+        JSONResponse: The error response.
+    """
+    if getattr(exc.orig, "sqlstate", None) != QUERY_CANCELED:
+        raise exc
+
+    route = request.scope.get("route")
+    record_statement_timeout(request.method, getattr(route, "path", request.url.path))
+    return JSONResponse({"detail": "Query timed out"}, status_code=503)
@@ -0,0 +1,183 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy.exc import DBAPIError
+
+from app.db.connection import AsyncSession, async_session_maker, set_session_timeout
+from app.utils.logging_configs import logger
+from config import settings
+
+
+def should_coalesce(session: AsyncSession) -> bool:
+    """
+    Tell whether a write made with this session may join a coalesced group.
+
+    Writes of an atomic batch have to stay in the batch's own transaction.
+
+    Args:
+        session (AsyncSession): The session of the request making the write.
+
+    Returns:
+        bool: True if the write should go through a coalescer.
+    """
+    return settings.WRITE_COALESCING_ENABLED and not session.info.get("atomic")
+
+
+def split_rounds(items: list[dict], key: str) -> list[list[tuple[int, dict]]]:
+    """
+    Split a group of writes so that no round touches the same row twice.
+
+    A row written by several callers of one group is written once per
+    round, in the order the callers arrived.
+
+    Args:
+        items (list[dict]): The writes of the group.
+        key (str): The item field identifying the row.
+
+    Returns:
+        list[list[tuple[int, dict]]]: The rounds, holding each item with its position.
+    """
+    rounds: list[dict] = []
+    for index, item in enumerate(items):
+        for entries in rounds:
+            if item[key] not in entries:
+                entries[item[key]] = (index, item)
+                break
+        else:
+            rounds.append({item[key]: (index, item)})
+    return [list(entries.values()) for entries in rounds]
+
+
+def get_group_timeout(timeouts: list[float | None]) -> float:
+    """
+    Pick the statement timeout of a group: the shortest among its callers.
+
+    Args:
+        timeouts (list[float | None]): The statement timeout of each caller; 0 or None means no limit.
+
+    Returns:
+        float: The timeout in seconds, 0 if no caller has a limit.
+    """
+    return min((timeout for timeout in timeouts if timeout), default=0)
+
+
+class WriteCoalescer:
+    """
+    Group commit for concurrent single-row writes of one kind.
+
+    The first write to arrive opens a group and waits up to
+    `settings.WRITE_COALESCING_WINDOW_SECONDS` for others, or until
+    `settings.WRITE_COALESCING_MAX_BATCH` have joined. The group is then
+    written by `flush` in one transaction with one commit, and every caller
+    receives its own row or its own error. The transaction runs with the
+    shortest statement timeout of the group's callers. If the group fails
+    in the database, its writes are retried one at a time, each with its
+    caller's timeout, so that only the caller that caused the failure sees
+    it. A caller cancelled, e.g. by a client disconnect, before its group
+    is written is left out of it; once the group is being written, the
+    write can no longer be cancelled and goes through. Groups are formed
+    per worker process.
+
+    Attributes:
+        flush (Callable): Writes a group given its items and a session; returns
+            one row or exception per item, in order.
+        groups (int): Number of groups committed.
+        writes (int): Number of writes in those groups.
+    """
+
+    def __init__(self, flush: Callable[[list, AsyncSession], Awaitable[list]]):
+        self.flush = flush
+        self.pending: list[tuple[Any, float | None, asyncio.Future]] = []
+        self.full = asyncio.Event()
+        self.task: asyncio.Task | None = None
+        self.groups = 0
+        self.writes = 0
+
+    async def submit(self, item: Any, session: AsyncSession):
+        """
+        Add a write to the next group and wait until it is committed.
+
+        Args:
+            item (Any): The values of the write, as expected by `flush`.
+            session (AsyncSession): The session of the caller, whose statement
+                timeout the group respects.
+
+        Raises:
+            HTTPException: If the write conflicts, e.g. the record is missing.
+
+        Returns:
+            Any: The written row.
+        """
+        future = asyncio.get_running_loop().create_future()
+        timeout = session.info.get(
+            "statement_timeout", settings.DB_STATEMENT_TIMEOUT_SECONDS
+        )
+        self.pending.append((item, timeout, future))
+        if len(self.pending) >= settings.WRITE_COALESCING_MAX_BATCH:
+            self.full.set()
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+        return await future
+
+    async def run(self):
+        """
+        Collect and write groups until no write is pending.
+        """
+        while self.pending:
+            try:
+                await asyncio.wait_for(
+                    self.full.wait(), settings.WRITE_COALESCING_WINDOW_SECONDS
+                )
+            except TimeoutError:
+                pass
+            self.full.clear()
+            group = self.pending[: settings.WRITE_COALESCING_MAX_BATCH]
+            del self.pending[: settings.WRITE_COALESCING_MAX_BATCH]
+            if len(self.pending) >= settings.WRITE_COALESCING_MAX_BATCH:
+                self.full.set()
+            await self.write(group)
+
+    async def write(self, group: list[tuple[Any, float | None, asyncio.Future]]):
+        """
+        Write a group in one transaction and resolve its callers.
+
+        Args:
+            group (list[tuple[Any, float | None, asyncio.Future]]): The items, the
+                statement timeouts and the futures of their callers.
+        """
+        # Callers cancelled while waiting no longer want their write.
+        group = [entry for entry in group if not entry[2].done()]
+        if not group:
+            return
+
+        try:
+            async with async_session_maker() as session:
+                set_session_timeout(
+                    session, get_group_timeout([timeout for _, timeout, _ in group])
+                )
+                results = await self.flush([item for item, _, _ in group], session)
+                await session.commit()
+        except DBAPIError as exc:
+            if len(group) > 1:
+                logger.warning(
+                    f"Coalesced write of {len(group)} rows failed, "
+                    f"retrying one by one: {exc.orig!r}"
+                )
+                for entry in group:
+                    await self.write([entry])
+                return
+            results = [exc]
+        except Exception as exc:
+            results = [exc] * len(group)
+        else:
+            self.groups += 1
+            self.writes += len(group)
+
+        for (_, _, future), result in zip(group, results):
+            # A caller cancelled during the write no longer waits.
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -0,0 +1,351 @@
+import asyncio
+import contextlib
+import json
+from typing import Callable
+
+import asyncpg
+from sqlalchemy import func, select
+
+from app.db.connection import async_session_maker
+from app.db.models import SubjectModel, TopicModel, TombstoneModel
+from app.schemas.subjects import SubjectResponseSchema
+from app.schemas.topics import TopicResponseSchema
+from app.services.changes import get_change_horizon, get_change_rows
+from app.utils.logging_configs import logger
+from config import settings
+
+CHANNEL = "faq_changes"
+PAGE_SIZE = 1000
+
+
+class Event:
+    """
+    A change pushed to Server-Sent Events subscribers.
+
+    The event is encoded once and the same bytes are written to every
+    subscriber.
+
+    Attributes:
+        id (int): The change sequence number, used as the SSE event ID.
+        subject_id (int | None): The subject the change belongs to.
+        payload (bytes): The encoded SSE message.
+    """
+
+    __slots__ = ("id", "subject_id", "payload")
+
+    def __init__(self, id: int, name: str, subject_id: int | None, data: str):
+        self.id = id
+        self.subject_id = subject_id
+        self.payload = f"id: {id}\nevent: {name}\ndata: {data}\n\n".encode()
+
+    @classmethod
+    def from_row(cls, row) -> "Event":
+        """
+        Build an event from a change feed row.
+
+        Args:
+            row (SubjectModel | TopicModel | TombstoneModel): The changed row.
+
+        Returns:
+            Event: The encoded event.
+        """
+        if isinstance(row, TombstoneModel):
+            data = json.dumps({"id": row.entity_id, "subject_id": row.subject_id})
+            return cls(row.change_seq, f"{row.entity}.deleted", row.subject_id, data)
+
+        action = "created" if row.updated_at is None else "updated"
+        if isinstance(row, SubjectModel):
+            data = SubjectResponseSchema.model_validate(row, from_attributes=True)
+            return cls(
+                row.change_seq, f"subject.{action}", row.id, data.model_dump_json()
+            )
+
+        data = TopicResponseSchema.model_validate(row, from_attributes=True)
+        return cls(
+            row.change_seq, f"topic.{action}", row.subject_id, data.model_dump_json()
+        )
+
+
+class Subscriber:
+    """
+    One Server-Sent Events connection waiting for changes.
+
+    Attributes:
+        subject_id (int | None): The subject to receive changes for, or None for all.
+        queue (asyncio.Queue): Events not yet written to the client.
+        overflowed (bool): Set when the client fell further behind than the queue allows.
+    """
+
+    def __init__(self, subject_id: int | None):
+        self.subject_id = subject_id
+        self.queue: asyncio.Queue[Event] = asyncio.Queue(settings.EVENTS_QUEUE_SIZE)
+        self.overflowed = False
+
+    def wants(self, event: Event) -> bool:
+        """
+        Whether the event belongs to this subscriber's stream.
+        """
+        return self.subject_id is None or self.subject_id == event.subject_id
+
+    def push(self, event: Event):
+        """
+        Queue an event without waiting.
+
+        A slow consumer is never allowed to hold up the others: when its
+        queue is full it is marked as overflowed and its stream is closed,
+        after which the client reconnects and catches up with `Last-Event-ID`.
+        """
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class ChangeNotifier:
+    """
+    Per-worker fan-out of the change feed to Server-Sent Events subscribers
+    and in-process handlers.
+
+    A single task tails the change feed and hands each new event to the
+    interested subscribers, and each changed row to the registered handlers,
+    so the database cost does not grow with the number of open streams. The task is woken by Postgres notifications sent
+    by the table triggers (which also cover SQLAdmin saves and other
+    workers), by `wake()` after a write in this worker, and by a periodic
+    poll as a fallback, e.g. behind PgBouncer where LISTEN is unavailable.
+    """
+
+    def __init__(self):
+        self.subscribers: dict[int | None, set[Subscriber]] = {}
+        self.handlers: list[Callable] = []
+        self.cursor: int | None = None
+        self.ready = asyncio.Event()
+        self.wakeup = asyncio.Event()
+        self.task: asyncio.Task | None = None
+        self.listener: asyncpg.Connection | None = None
+
+    def subscribe(self, subject_id: int | None) -> Subscriber:
+        """
+        Register a new subscriber and start the notifier if needed.
+
+        Args:
+            subject_id (int | None): The subject to follow, or None for all changes.
+
+        Returns:
+            Subscriber: The registered subscriber.
+        """
+        subscriber = Subscriber(subject_id)
+        self.subscribers.setdefault(subject_id, set()).add(subscriber)
+        self.start()
+        return subscriber
+
+    def add_handler(self, handler: Callable):
+        """
+        Register a function called with every changed row and start the notifier.
+
+        Handlers stay registered for the lifetime of the worker and keep the
+        notifier running.
+
+        Args:
+            handler (Callable): Called with a SubjectModel, TopicModel or TombstoneModel.
+        """
+        self.handlers.append(handler)
+        self.start()
+
+    def start(self):
+        """
+        Start the notifier task if it is not running and wake it up.
+        """
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+        self.wake()
+
+    def unsubscribe(self, subscriber: Subscriber):
+        """
+        Remove a subscriber.
+
+        Args:
+            subscriber (Subscriber): The subscriber to remove.
+        """
+        group = self.subscribers.get(subscriber.subject_id)
+        if group is not None:
+            group.discard(subscriber)
+            if not group:
+                del self.subscribers[subscriber.subject_id]
+
+    def wake(self, *args):
+        """
+        Ask the notifier to read the change feed now.
+        """
+        self.wakeup.set()
+
+    def dispatch(self, event: Event):
+        """
+        Hand an event to every subscriber following it.
+
+        Args:
+            event (Event): The event to dispatch.
+        """
+        for subscriber in self.subscribers.get(None, ()):
+            subscriber.push(event)
+        if event.subject_id is not None:
+            for subscriber in self.subscribers.get(event.subject_id, ()):
+                subscriber.push(event)
+
+    async def listen(self):
+        """
+        Open the LISTEN connection if it is not open.
+        """
+        if settings.DB_PGBOUNCER_MODE:
+            return
+        if self.listener is not None and not self.listener.is_closed():
+            return
+        self.listener = await asyncpg.connect(
+            settings.DATABASE_URL.replace("postgresql+asyncpg", "postgresql")
+        )
+        await self.listener.add_listener(CHANNEL, self.wake)
+
+    async def poll(self):
+        """
+        Read the change feed from the cursor and dispatch the new events.
+        """
+        if self.cursor is None:
+            async with async_session_maker() as session:
+                self.cursor = await latest_change_seq(session)
+            self.ready.set()
+            return
+
+        has_more = True
+        while has_more:
+            async with async_session_maker() as session:
+                rows, has_more = await get_change_rows(self.cursor, PAGE_SIZE, session)
+            for row in rows:
+                for handler in self.handlers:
+                    handler(row)
+                if self.subscribers:
+                    self.dispatch(Event.from_row(row))
+            if rows:
+                self.cursor = rows[-1].change_seq
+
+    async def run(self):
+        """
+        Tail the change feed while there are subscribers or handlers and idle otherwise.
+        """
+        while True:
+            if not self.subscribers and not self.handlers:
+                self.cursor = None
+                self.ready.clear()
+                await self.close_listener()
+                if not self.subscribers and not self.handlers:
+                    self.wakeup.clear()
+                    await self.wakeup.wait()
+                continue
+
+            try:
+                await self.listen()
+                self.wakeup.clear()
+                await self.poll()
+            except Exception as exc:
+                logger.warning(f"Change notifier error: {exc!r}")
+                await self.close_listener()
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    self.wakeup.wait(), timeout=settings.EVENTS_POLL_SECONDS
+                )
+
+    async def close_listener(self):
+        """
+        Close the LISTEN connection.
+        """
+        listener, self.listener = self.listener, None
+        if listener is not None and not listener.is_closed():
+            with contextlib.suppress(Exception):
+                await listener.close()
+
+    async def stop(self):
+        """
+        Stop the notifier task and close the LISTEN connection.
+        """
+        if self.task is not None:
+            self.task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.task
+        await self.close_listener()
+
+
+async def latest_change_seq(session) -> int:
+    """
+    Find the highest committed change sequence number a cursor may start from.
+
+    The result stays below the change horizon, so changes still being
+    committed by older transactions are read from the feed later.
+
+    Args:
+        session (AsyncSession): The database session.
+
+    Returns:
+        int: The sequence number, 0 if nothing has changed yet.
+    """
+    horizon = await get_change_horizon(session)
+    result = await session.execute(
+        select(
+            func.greatest(
+                select(func.max(SubjectModel.change_seq)).scalar_subquery(),
+                select(func.max(TopicModel.change_seq)).scalar_subquery(),
+                select(func.max(TombstoneModel.change_seq)).scalar_subquery(),
+            )
+        )
+    )
+    return min(result.scalar() or 0, horizon - 1)
+
+
+notifier = ChangeNotifier()
+
+
+async def stream_events(subject_id: int | None, last_event_id: int | None):
+    """
+    Produce the Server-Sent Events stream of one client.
+
+    With `last_event_id` the changes the client missed are replayed from
+    the change feed first; events that were also queued live are skipped.
+    The stream ends after an overflow so the client reconnects and catches
+    up from the last event it received.
+
+    Args:
+        subject_id (int | None): The subject to follow, or None for all changes.
+        last_event_id (int | None): The ID of the last event the client received.
+
+    Yields:
+        bytes: Encoded SSE messages.
+    """
+    subscriber = notifier.subscribe(subject_id)
+    try:
+        yield f"retry: {settings.EVENTS_RETRY_MILLISECONDS}\n\n".encode()
+        await notifier.ready.wait()
+
+        sent = 0
+        if last_event_id is not None:
+            sent = last_event_id
+            has_more = True
+            while has_more:
+                async with async_session_maker() as session:
+                    rows, has_more = await get_change_rows(sent, PAGE_SIZE, session)
+                for row in rows:
+                    event = Event.from_row(row)
+                    if subscriber.wants(event):
+                        yield event.payload
+                if rows:
+                    sent = rows[-1].change_seq
+
+        while not (subscriber.overflowed and subscriber.queue.empty()):
+            try:
+                event = await asyncio.wait_for(
+                    subscriber.queue.get(), timeout=settings.EVENTS_KEEPALIVE_SECONDS
+                )
+            except asyncio.TimeoutError:
+                yield b": keep-alive\n\n"
+                continue
+            if event.id > sent:
+                sent = event.id
+                yield event.payload
+    finally:
+        notifier.unsubscribe(subscriber)
@@ -0,0 +1,356 @@
+import asyncio
+import contextlib
+import fcntl
+import gzip
+import json
+import mmap
+import os
+import struct
+import time
+from itertools import groupby
+
+from pydantic import TypeAdapter
+from sqlalchemy import desc, select, text
+
+from app.db.connection import async_session_maker
+from app.db.models import SubjectModel, TopicModel
+from app.schemas.subjects import SubjectResponseSchema, SubjectWithTopicsResponseSchema
+from app.schemas.topics import TopicPageResponseSchema, TopicResponseSchema
+from app.utils.events import notifier
+from app.utils.logging_configs import logger
+from config import settings
+
+CURRENT_FILE = "CURRENT"
+LOCK_FILE = ".lock"
+HEADER = struct.Struct("<Q")
+
+# The read snapshot's next transaction ID, shifted, minus the transactions
+# still running in it. It grows whenever a transaction gets an ID or
+# finishes, so every commit moves it, while two reads with no transaction
+# started or finished in between agree on it.
+DATA_VERSION = text(
+    "SELECT (pg_snapshot_xmax(s)::text::bigint << 16) - "
+    "(SELECT count(*) FROM pg_snapshot_xip(s)) FROM pg_current_snapshot() AS s"
+)
+
+subject_list_adapter = TypeAdapter(list[SubjectResponseSchema])
+subject_detail_adapter = TypeAdapter(SubjectWithTopicsResponseSchema)
+topic_adapter = TypeAdapter(TopicResponseSchema)
+topic_list_adapter = TypeAdapter(list[TopicResponseSchema])
+topic_page_adapter = TypeAdapter(TopicPageResponseSchema)
+
+
+def first_page(topics: list[dict], limit: int) -> tuple[list[dict], int | None]:
+    """
+    Cut a subject's topics to the first page, like `get_topic_page`.
+    """
+    if len(topics) > limit:
+        return topics[:limit], topics[limit - 1]["id"]
+    return topics, None
+
+
+def snapshot_path(version: int) -> str:
+    """
+    Path of the snapshot file for a data version.
+    """
+    return os.path.join(settings.SNAPSHOT_DIR, f"snapshot-{version}.bin")
+
+
+def read_current_version() -> int | None:
+    """
+    Read the version of the snapshot currently published on disk.
+
+    Returns:
+        int | None: The version, or None if no snapshot has been published.
+    """
+    try:
+        with open(os.path.join(settings.SNAPSHOT_DIR, CURRENT_FILE)) as file:
+            return int(file.read())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def write_snapshot(version: int, subjects: list[dict], topics: list[dict]):
+    """
+    Serialize every read response, compress it and publish the snapshot file.
+
+    The file starts with the length of a JSON index mapping request paths to
+    the offsets of the plain and gzip-compressed bodies that follow it. It is
+    written under a temporary name and renamed, then `CURRENT` is replaced
+    the same way, so readers never see a partial snapshot.
+
+    Args:
+        version (int): The data version the rows were read at.
+        subjects (list[dict]): All subjects, newest first.
+        topics (list[dict]): All topics, newest first.
+    """
+    bodies = {
+        "/api/subjects": subject_list_adapter.dump_json(
+            subject_list_adapter.validate_python(subjects)
+        ),
+        "/api/topics": topic_list_adapter.dump_json(
+            topic_list_adapter.validate_python(topics)
+        ),
+    }
+
+    topics_by_subject = {subject["id"]: [] for subject in subjects}
+    ordered = sorted(topics, key=lambda topic: (topic["subject_id"], topic["id"]))
+    for subject_id, group in groupby(ordered, key=lambda topic: topic["subject_id"]):
+        topics_by_subject[subject_id] = list(group)
+
+    for topic in topics:
+        bodies[f"/api/topics/{topic['id']}"] = topic_adapter.dump_json(
+            topic_adapter.validate_python(topic)
+        )
+    for subject in subjects:
+        subject_topics = topics_by_subject[subject["id"]]
+        embedded, topics_cursor = first_page(
+            subject_topics, settings.SUBJECT_TOPICS_LIMIT
+        )
+        bodies[f"/api/subjects/{subject['id']}"] = subject_detail_adapter.dump_json(
+            subject_detail_adapter.validate_python(
+                {**subject, "topics": embedded, "topics_cursor": topics_cursor}
+            )
+        )
+        page, next_cursor = first_page(subject_topics, settings.TOPICS_PAGE_SIZE)
+        bodies[f"/api/topics/subject/{subject['id']}"] = topic_page_adapter.dump_json(
+            topic_page_adapter.validate_python(
+                {"topics": page, "next_cursor": next_cursor}
+            )
+        )
+
+    entries = {}
+    blob = bytearray()
+    for key, body in bodies.items():
+        compressed = gzip.compress(body, compresslevel=6, mtime=0)
+        offset = len(blob)
+        blob += body
+        if len(compressed) < len(body):
+            entries[key] = [offset, len(body), len(blob), len(compressed)]
+            blob += compressed
+        else:
+            entries[key] = [offset, len(body), 0, 0]
+
+    index = json.dumps({"version": version, "entries": entries}).encode()
+    path = snapshot_path(version)
+    with open(f"{path}.tmp", "wb") as file:
+        file.write(HEADER.pack(len(index)))
+        file.write(index)
+        file.write(blob)
+    os.replace(f"{path}.tmp", path)
+
+    current = os.path.join(settings.SNAPSHOT_DIR, CURRENT_FILE)
+    with open(f"{current}.tmp", "w") as file:
+        file.write(str(version))
+    os.replace(f"{current}.tmp", current)
+
+    # Keep the previous snapshot for workers that have not switched yet.
+    snapshots = sorted(
+        (
+            int(name[len("snapshot-") : -len(".bin")])
+            for name in os.listdir(settings.SNAPSHOT_DIR)
+            if name.startswith("snapshot-") and name.endswith(".bin")
+        ),
+        reverse=True,
+    )
+    for old in snapshots[2:]:
+        os.remove(snapshot_path(old))
+
+
+async def build_snapshot() -> int | None:
+    """
+    Regenerate the snapshot if the catalog changed since the published one.
+
+    Only one process per host builds at a time; the others skip the build
+    and pick up the published file.
+
+    Returns:
+        int | None: The version of the new snapshot, or None if nothing was built.
+    """
+    os.makedirs(settings.SNAPSHOT_DIR, exist_ok=True)
+    with open(os.path.join(settings.SNAPSHOT_DIR, LOCK_FILE), "w") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return None
+
+        async with async_session_maker() as session:
+            await session.connection(
+                execution_options={"isolation_level": "REPEATABLE READ"}
+            )
+            version = (await session.execute(DATA_VERSION)).scalar()
+            if version == read_current_version():
+                return None
+
+            subjects = await session.execute(
+                select(
+                    SubjectModel.id,
+                    SubjectModel.title,
+                    SubjectModel.created_at,
+                    SubjectModel.updated_at,
+                ).order_by(desc(SubjectModel.id))
+            )
+            topics = await session.execute(
+                select(
+                    TopicModel.id,
+                    TopicModel.title,
+                    TopicModel.description,
+                    TopicModel.subject_id,
+                    TopicModel.created_at,
+                    TopicModel.updated_at,
+                ).order_by(desc(TopicModel.id))
+            )
+            subjects = [dict(row) for row in subjects.mappings()]
+            topics = [dict(row) for row in topics.mappings()]
+
+        start = time.perf_counter()
+        await asyncio.to_thread(write_snapshot, version, subjects, topics)
+        logger.info(
+            f"Snapshot {version} written in {time.perf_counter() - start:.3f}s "
+            f"({len(subjects)} subjects, {len(topics)} topics)"
+        )
+        return version
+
+
+class SnapshotBuilder:
+    """
+    Debounced background rebuilds of the snapshot.
+
+    Every change marks the snapshot dirty; a rebuild starts once no change
+    has arrived for `settings.SNAPSHOT_DEBOUNCE_SECONDS`, so a burst of
+    admin edits produces a single rebuild. Under a steady stream of writes
+    the rebuild starts anyway `settings.SNAPSHOT_MAX_DELAY_SECONDS` after
+    the first change it has not covered.
+    """
+
+    def __init__(self):
+        self.task: asyncio.Task | None = None
+        self.dirty = False
+        self.dirty_since: float | None = None
+
+    def schedule(self, *args):
+        """
+        Mark the snapshot as outdated and start the rebuild task if needed.
+        """
+        self.dirty = True
+        if self.dirty_since is None:
+            self.dirty_since = time.monotonic()
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    async def run(self):
+        """
+        Wait for changes to settle, then rebuild until no change is pending.
+        """
+        while self.dirty:
+            self.dirty = False
+            remaining = settings.SNAPSHOT_MAX_DELAY_SECONDS - (
+                time.monotonic() - self.dirty_since
+            )
+            if remaining > 0:
+                await asyncio.sleep(min(settings.SNAPSHOT_DEBOUNCE_SECONDS, remaining))
+                overdue = (
+                    time.monotonic() - self.dirty_since
+                    >= settings.SNAPSHOT_MAX_DELAY_SECONDS
+                )
+                if self.dirty and not overdue:
+                    continue
+
+            # The build reads everything committed up to now.
+            self.dirty = False
+            self.dirty_since = None
+            try:
+                await build_snapshot()
+            except Exception as exc:
+                logger.warning(f"Snapshot build failed: {exc!r}")
+
+    async def stop(self):
+        """
+        Cancel a pending rebuild.
+        """
+        if self.task is not None:
+            self.task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.task
+
+
+class SnapshotStore:
+    """
+    Read access to the published snapshot, memory-mapped once per version.
+
+    Attributes:
+        version (int | None): The version currently mapped.
+        entries (dict): Maps request paths to body offsets in the mapped file.
+    """
+
+    def __init__(self):
+        self.version: int | None = None
+        self.entries: dict[str, list[int]] = {}
+        self.mapped: mmap.mmap | None = None
+        self.checked_at = 0.0
+
+    def refresh(self):
+        """
+        Switch to a newer published snapshot, checking the disk at most once a second.
+        """
+        now = time.monotonic()
+        if now - self.checked_at < 1:
+            return
+        self.checked_at = now
+
+        version = read_current_version()
+        if version is None or version == self.version:
+            return
+
+        try:
+            with open(snapshot_path(version), "rb") as file:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return
+        (length,) = HEADER.unpack_from(mapped)
+        index = json.loads(mapped[HEADER.size : HEADER.size + length])
+        base = HEADER.size + length
+
+        previous = self.mapped
+        self.entries = {
+            key: [offset + base, size, gz_offset + base, gz_size]
+            for key, (offset, size, gz_offset, gz_size) in index["entries"].items()
+        }
+        self.mapped = mapped
+        self.version = version
+        if previous is not None:
+            previous.close()
+
+    def get(self, path: str, accept_gzip: bool) -> tuple[bytes, bool] | None:
+        """
+        Look up the pre-serialized response body for a request path.
+
+        Args:
+            path (str): The request path.
+            accept_gzip (bool): Whether the client accepts gzip encoding.
+
+        Returns:
+            tuple[bytes, bool] | None: The body and whether it is gzip-compressed,
+                or None if the snapshot does not cover the path.
+        """
+        self.refresh()
+        entry = self.entries.get(path)
+        if entry is None:
+            return None
+
+        offset, size, gz_offset, gz_size = entry
+        if accept_gzip and gz_size:
+            return self.mapped[gz_offset : gz_offset + gz_size], True
+        return self.mapped[offset : offset + size], False
+
+
+snapshot_builder = SnapshotBuilder()
+snapshot_store = SnapshotStore()
+
+
+def start_snapshots():
+    """
+    Rebuild the snapshot on every catalog change and once at startup.
+    """
+    notifier.add_handler(snapshot_builder.schedule)
+    snapshot_builder.schedule()
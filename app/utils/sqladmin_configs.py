@@ -1,8 +1,211 @@
-from sqladmin import ModelView
+from dataclasses import dataclass, field
+
+from sqladmin import Admin, ModelView
+from sqladmin.pagination import Pagination
+from sqlalchemy import Executable, Select, asc, desc, func, or_, select, text
+from starlette.applications import Starlette
+from starlette.datastructures import URL
+from starlette.requests import Request
+from app.db.connection import engine
 from app.db.models import SubjectModel, TopicModel
+from config import settings
+
+ESTIMATED_COUNT_QUERY = text(
+    "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"
+)
+
+
+@dataclass
+class KeysetPagination(Pagination):
+    """
+    Pagination whose previous and next links continue from the rows shown.
+
+    Attributes:
+        cursors (dict): Extra query parameters of the page links, keyed by page number.
+    """
+
+    cursors: dict[int, dict] = field(default_factory=dict)
 
+    def add_pagination_urls(self, base_url: URL) -> None:
+        super().add_pagination_urls(base_url.remove_query_params(["after", "before"]))
+        for control in self.page_controls:
+            if control.number in self.cursors:
+                control.url = str(
+                    URL(control.url).include_query_params(
+                        **self.cursors[control.number]
+                    )
+                )
 
-class SubjectAdmin(ModelView, model=SubjectModel):
+
+class FastListMixin:
+    """
+    List page behaviour for admin views over large tables.
+
+    Unfiltered pages use the planner's row estimate from `pg_class` once the
+    table is larger than `settings.ADMIN_ESTIMATED_COUNT_THRESHOLD`, and
+    filtered counts stop at that threshold, so no page load runs an exact
+    `COUNT(*)` over millions of rows. Sorting is limited to indexed columns
+    with the primary key as a tie-breaker, and search uses the trigram
+    indexes on the searchable columns. In ID order, the previous and next
+    links carry the first or last ID shown, so paging through the list
+    seeks on the primary key instead of skipping rows with OFFSET; jumps to
+    a numbered page still use OFFSET.
+
+    Only the public `ModelView` API is used: the `list_query`, `sort_query`,
+    `search_query` and `count_query` hooks, `session_maker` and the `Pagination`
+    fields. `list` itself is replaced because SQLAdmin always pages with
+    OFFSET; it is written against sqladmin 0.17.0, pinned in
+    `docker/requirements.txt`, and covered by `tests/test_admin_list.py`.
+    The list columns are plain columns, so no relationship is loaded.
+    """
+
+    def is_filtered(self, request: Request) -> bool:
+        """
+        Whether the list query narrows the table beyond search.
+
+        Args:
+            request (Request): The incoming HTTP request object.
+
+        Returns:
+            bool: True if the list query applies filters.
+        """
+        return False
+
+    def get_sort_names(self) -> list[str]:
+        """
+        Names of the columns the list can be sorted by.
+
+        Returns:
+            list[str]: The keys of `column_sortable_list`.
+        """
+        return [column.key for column in self.column_sortable_list]
+
+    async def run_query(self, stmt: Executable) -> list:
+        """
+        Run a list page statement in its own session.
+
+        Args:
+            stmt (Executable): The statement to run.
+
+        Returns:
+            list: The unique scalars of the result.
+        """
+        async with self.session_maker(expire_on_commit=False) as session:
+            result = await session.execute(stmt)
+            return result.scalars().unique().all()
+
+    async def count(self, request: Request, stmt: Select | None = None) -> int:
+        if stmt is None:
+            stmt = self.count_query(request)
+        rows = await self.run_query(stmt)
+        return rows[0]
+
+    async def fast_count(self, request: Request, stmt: Select, filtered: bool) -> int:
+        """
+        Count the rows of a list page without scanning the whole table.
+
+        Args:
+            request (Request): The incoming HTTP request object.
+            stmt (Select): The list statement, including filters and search.
+            filtered (bool): Whether the statement narrows the table.
+
+        Returns:
+            int: The estimated or exact number of rows, capped at the threshold for
+                filtered statements.
+        """
+        threshold = settings.ADMIN_ESTIMATED_COUNT_THRESHOLD
+
+        if not filtered:
+            rows = await self.run_query(
+                ESTIMATED_COUNT_QUERY.bindparams(table_name=self.model.__tablename__)
+            )
+            if rows and rows[0] >= threshold:
+                return rows[0]
+            return await self.count(request)
+
+        capped = stmt.order_by(None).limit(threshold).subquery()
+        return await self.count(request, select(func.count()).select_from(capped))
+
+    def get_id_order(self, request: Request) -> bool | None:
+        """
+        Tell whether the list is ordered by ID and in which direction.
+
+        Args:
+            request (Request): The incoming HTTP request object.
+
+        Returns:
+            bool | None: True for descending, False for ascending, None when the
+                list is sorted by another column.
+        """
+        sort_by = request.query_params.get("sortBy", None)
+        if sort_by not in self.get_sort_names():
+            return True
+        if sort_by == "id":
+            return request.query_params.get("sort", "asc") == "desc"
+        return None
+
+    async def list(self, request: Request) -> Pagination:
+        page = self.validate_page_number(request.query_params.get("page"), 1)
+        page_size = self.validate_page_number(request.query_params.get("pageSize"), 0)
+        page_size = min(page_size or self.page_size, max(self.page_size_options))
+        search = request.query_params.get("search", None)
+
+        stmt = self.sort_query(self.list_query(request), request)
+        if search:
+            stmt = self.search_query(stmt=stmt, term=search)
+
+        count = await self.fast_count(
+            request, stmt, filtered=bool(search) or self.is_filtered(request)
+        )
+
+        descending = self.get_id_order(request)
+        after = self.validate_page_number(request.query_params.get("after"), 0)
+        before = self.validate_page_number(request.query_params.get("before"), 0)
+        id_column = self.model.id
+        if descending is not None and after:
+            stmt = stmt.where(id_column < after if descending else id_column > after)
+            rows = await self.run_query(stmt.limit(page_size))
+        elif descending is not None and before:
+            # Read the previous page backwards from the cursor, then restore
+            # the list order.
+            stmt = stmt.where(id_column > before if descending else id_column < before)
+            stmt = stmt.order_by(None).order_by(
+                asc(id_column) if descending else desc(id_column)
+            )
+            rows = list(reversed(await self.run_query(stmt.limit(page_size))))
+        else:
+            stmt = stmt.limit(page_size).offset((page - 1) * page_size)
+            rows = await self.run_query(stmt)
+
+        pagination = KeysetPagination(
+            rows=rows, page=page, page_size=page_size, count=count
+        )
+        if descending is not None and rows:
+            pagination.cursors[page + 1] = {"after": rows[-1].id}
+            if page > 1:
+                pagination.cursors[page - 1] = {"before": rows[0].id}
+        return pagination
+
+    def sort_query(self, stmt: Select, request: Request) -> Select:
+        sort_by = request.query_params.get("sortBy", None)
+        if sort_by not in self.get_sort_names():
+            return stmt.order_by(desc(self.model.id))
+
+        is_desc = request.query_params.get("sort", "asc") == "desc"
+        order = desc if is_desc else asc
+        stmt = stmt.order_by(order(getattr(self.model, sort_by)))
+        if sort_by != "id":
+            stmt = stmt.order_by(order(self.model.id))
+        return stmt
+
+    def search_query(self, stmt: Select, term: str) -> Select:
+        expressions = [
+            column.ilike(f"%{term}%") for column in self.column_searchable_list
+        ]
+        return stmt.filter(or_(*expressions))
+
+
+class SubjectAdmin(FastListMixin, ModelView, model=SubjectModel):
     """
     Admin view for the SubjectModel.
 
@@ -10,6 +213,9 @@ class SubjectAdmin(ModelView, model=SubjectModel):
 
     Attributes:
         column_list (list): List of columns to display in the admin interface.
+        column_searchable_list (list): Columns searched through their trigram index.
+        column_sortable_list (list): Indexed columns the list can be sorted by.
+        form_excluded_columns (list): Columns maintained by the database.
     """
 
     column_list = [
@@ -18,21 +224,73 @@ class SubjectAdmin(ModelView, model=SubjectModel):
         SubjectModel.created_at,
         SubjectModel.updated_at,
     ]
+    column_searchable_list = [SubjectModel.title]
+    column_sortable_list = [SubjectModel.id, SubjectModel.title]
+    form_excluded_columns = [SubjectModel.change_seq]
 
 
-class TopicAdmin(ModelView, model=TopicModel):
+class TopicAdmin(FastListMixin, ModelView, model=TopicModel):
     """
     Admin view for the TopicModel.
 
     This class provides an admin interface for managing topics in the database.
+    The list can be narrowed to one subject with the `subject_id` query parameter.
 
     Attributes:
         column_list (list): List of columns to display in the admin interface.
+        column_searchable_list (list): Columns searched through their trigram index.
+        column_sortable_list (list): Indexed columns the list can be sorted by.
+        form_excluded_columns (list): Columns maintained by the database.
     """
 
     column_list = [
         TopicModel.id,
         TopicModel.title,
+        TopicModel.subject_id,
         TopicModel.created_at,
         TopicModel.updated_at,
     ]
+    column_searchable_list = [TopicModel.title]
+    column_sortable_list = [TopicModel.id, TopicModel.title]
+    form_excluded_columns = [TopicModel.change_seq]
+
+    def get_subject_filter(self, request: Request) -> int | None:
+        """
+        Read the subject filter from the request.
+
+        Args:
+            request (Request): The incoming HTTP request object.
+
+        Returns:
+            int | None: The ID of the subject to filter by, if any.
+        """
+        subject_id = request.query_params.get("subject_id")
+        return self.validate_page_number(subject_id, 0) or None
+
+    def is_filtered(self, request: Request) -> bool:
+        return self.get_subject_filter(request) is not None
+
+    def list_query(self, request: Request) -> Select:
+        stmt = select(TopicModel)
+        subject_id = self.get_subject_filter(request)
+        if subject_id is not None:
+            stmt = stmt.where(TopicModel.subject_id == subject_id)
+        return stmt
+
+
+def create_admin(app: Starlette) -> Admin:
+    """
+    Create the admin interface and mount it on the given application.
+
+    Args:
+        app (Starlette): The application to mount the admin interface on.
+
+    Returns:
+        Admin: The configured admin interface.
+    """
+    admin = Admin(app, engine)
+
+    # AdminPanel Pages
+    admin.add_view(SubjectAdmin)
+    admin.add_view(TopicAdmin)
+    return admin
@@ -0,0 +1,60 @@
+import os
+import time
+
+from app.utils.logging_configs import logger
+
+
+def get_process_start_time() -> float:
+    """
+    Find when the current process started, including interpreter start-up.
+
+    Read from /proc on Linux; elsewhere the time of this call is used.
+
+    Returns:
+        float: The start time as a Unix timestamp.
+    """
+    try:
+        with open("/proc/self/stat") as stat:
+            # Fields after the command name, which may contain spaces;
+            # the start time is field 22, in clock ticks since boot.
+            fields = stat.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime") as uptime:
+            uptime_seconds = float(uptime.read().split()[0])
+    except (OSError, IndexError, ValueError):
+        return time.time()
+    age = uptime_seconds - int(fields[19]) / os.sysconf("SC_CLK_TCK")
+    return time.time() - age
+
+
+# docker/main.sh exports the time the container entry point started, so the
+# reported figures of the first workers include the container start-up.
+# serve.py removes it once they are started; later workers use their own
+# process start.
+STARTED_AT = float(os.environ.get("APP_STARTED_AT") or get_process_start_time())
+
+ready_seconds: float | None = None
+first_request_seconds: float | None = None
+
+
+def mark_ready():
+    """
+    Record that the lifespan warm-up has finished and the worker can serve traffic.
+    """
+    global ready_seconds
+    ready_seconds = time.time() - STARTED_AT
+    logger.info(f"Worker {os.getpid()} ready in {ready_seconds:.3f}s")
+
+
+def mark_first_request():
+    """
+    Record the time from process start to the first served request.
+
+    Only the first call per worker has an effect.
+    """
+    global first_request_seconds
+    if first_request_seconds is None:
+        first_request_seconds = time.time() - STARTED_AT
+        logger.info(
+            f"Worker {os.getpid()} served first request "
+            f"{first_request_seconds:.3f}s after start"
+        )
@@ -0,0 +1,243 @@
+import asyncio
+import bisect
+import unicodedata
+
+from sqlalchemy import select
+
+from app.db.connection import async_session_maker
+from app.db.models import SubjectModel, TopicModel, TombstoneModel
+from app.utils.events import notifier
+from app.utils.logging_configs import logger
+from config import settings
+
+
+def normalize(title: str) -> str:
+    """
+    Normalize a title for prefix matching.
+
+    Case and accents are ignored and runs of whitespace collapse to one space.
+
+    Args:
+        title (str): The title to normalize.
+
+    Returns:
+        str: The normalized title.
+    """
+    decomposed = unicodedata.normalize("NFKD", title.casefold())
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.split())
+
+
+class PrefixIndex:
+    """
+    In-memory index of subject and topic titles for typeahead.
+
+    Entries are kept in a list sorted by normalized title, so a prefix
+    lookup is one binary search followed by a scan of at most `limit`
+    entries.
+
+    Attributes:
+        entries (list[tuple]): Sorted (normalized title, kind, id, title, subject_id) tuples.
+        keys (dict): Maps (kind, id) to the entry currently in the index.
+        topics_by_subject (dict): Maps a subject ID to the IDs of its topics.
+        loaded (bool): Whether the index has been built from the database.
+        loading (bool): Whether the index is being built from the database.
+        pending (list): Change feed rows received while the index was being built.
+    """
+
+    def __init__(self):
+        self.entries: list[tuple] = []
+        self.keys: dict[tuple[str, int], tuple] = {}
+        self.topics_by_subject: dict[int, set[int]] = {}
+        self.loaded = False
+        self.loading = False
+        self.pending: list = []
+
+    def load(self, records):
+        """
+        Replace the index contents in one pass and apply the changes received meanwhile.
+
+        Args:
+            records (Iterable[tuple]): (kind, id, title, subject_id) tuples.
+        """
+        self.entries = sorted(
+            (normalize(title), kind, id, title, subject_id)
+            for kind, id, title, subject_id in records
+        )
+        self.keys = {(entry[1], entry[2]): entry for entry in self.entries}
+        self.topics_by_subject = {}
+        for entry in self.entries:
+            if entry[1] == "topic":
+                self.topics_by_subject.setdefault(entry[4], set()).add(entry[2])
+
+        self.loaded = True
+        pending, self.pending = self.pending, []
+        for row in pending:
+            self.apply(row)
+
+    def add(self, kind: str, id: int, title: str, subject_id: int):
+        """
+        Insert a title, replacing the previous title of the same record.
+
+        Args:
+            kind (str): "subject" or "topic".
+            id (int): The ID of the record.
+            title (str): The title of the record.
+            subject_id (int): The subject of a topic; for subjects, their own ID.
+        """
+        self.remove(kind, id)
+        entry = (normalize(title), kind, id, title, subject_id)
+        bisect.insort(self.entries, entry)
+        self.keys[(kind, id)] = entry
+        if kind == "topic":
+            self.topics_by_subject.setdefault(subject_id, set()).add(id)
+
+    def remove(self, kind: str, id: int):
+        """
+        Remove a record from the index; removing a subject also removes its topics.
+
+        Args:
+            kind (str): "subject" or "topic".
+            id (int): The ID of the record.
+        """
+        entry = self.keys.pop((kind, id), None)
+        if entry is not None:
+            index = bisect.bisect_left(self.entries, entry)
+            del self.entries[index]
+            if kind == "topic":
+                self.topics_by_subject.get(entry[4], set()).discard(id)
+
+        if kind == "subject":
+            for topic_id in self.topics_by_subject.pop(id, set()):
+                self.remove("topic", topic_id)
+
+    def apply(self, row):
+        """
+        Apply a row from the change feed, or keep it for later while loading.
+
+        Rows are dropped while the index is neither loaded nor loading, as
+        when typeahead is disabled or the last load failed; the next load
+        reads them from the database.
+
+        Args:
+            row (SubjectModel | TopicModel | TombstoneModel): The changed row.
+        """
+        if not self.loaded:
+            if self.loading:
+                self.pending.append(row)
+        elif isinstance(row, TombstoneModel):
+            self.remove(row.entity, row.entity_id)
+        elif isinstance(row, SubjectModel):
+            self.add("subject", row.id, row.title, row.id)
+        elif isinstance(row, TopicModel):
+            self.add("topic", row.id, row.title, row.subject_id)
+
+    def search(self, prefix: str, limit: int) -> list[dict]:
+        """
+        Find the titles starting with a prefix, in alphabetical order.
+
+        Args:
+            prefix (str): The text typed so far.
+            limit (int): The maximum number of matches.
+
+        Returns:
+            list[dict]: The matching records.
+        """
+        key = normalize(prefix)
+        start = bisect.bisect_left(self.entries, (key,))
+        matches = []
+        for entry in self.entries[start : start + limit]:
+            if not entry[0].startswith(key):
+                break
+            matches.append(
+                {
+                    "kind": entry[1],
+                    "id": entry[2],
+                    "title": entry[3],
+                    "subject_id": entry[4],
+                }
+            )
+        return matches
+
+
+typeahead_index = PrefixIndex()
+load_lock = asyncio.Lock()
+
+
+async def load_typeahead_index() -> bool:
+    """
+    Build the typeahead index from the database and keep it up to date.
+
+    The index follows the change feed, so edits made through other workers
+    or SQLAdmin are applied as well. The notifier cursor is taken before the
+    titles are read; changes in between are replayed, and applying a change
+    twice is harmless.
+
+    Returns:
+        bool: True if the index is loaded.
+    """
+    async with load_lock:
+        if typeahead_index.loaded:
+            return True
+        typeahead_index.loading = True
+        try:
+            if typeahead_index.apply not in notifier.handlers:
+                notifier.add_handler(typeahead_index.apply)
+            await asyncio.wait_for(
+                notifier.ready.wait(), timeout=settings.TYPEAHEAD_LOAD_TIMEOUT_SECONDS
+            )
+            # Everything received so far is already committed and will be read below.
+            typeahead_index.pending.clear()
+
+            async with async_session_maker() as session:
+                subjects = await session.execute(
+                    select(SubjectModel.id, SubjectModel.title)
+                )
+                topics = await session.execute(
+                    select(TopicModel.id, TopicModel.title, TopicModel.subject_id)
+                )
+                records = [("subject", id, title, id) for id, title in subjects]
+                records += [
+                    ("topic", id, title, subject_id) for id, title, subject_id in topics
+                ]
+        except Exception as exc:
+            logger.warning(f"Typeahead index could not be loaded: {exc!r}")
+            typeahead_index.pending.clear()
+            return False
+        finally:
+            typeahead_index.loading = False
+
+        typeahead_index.load(records)
+        logger.info(
+            f"Typeahead index loaded with {len(typeahead_index.entries)} titles"
+        )
+        return True
+
+
+async def resync_typeahead_index(keys: list[tuple[str, int]], session):
+    """
+    Reload records from the database after changes to them were rolled back.
+
+    A subject is reloaded with its topics, since removing a subject from the
+    index also removed them.
+
+    Args:
+        keys (list[tuple[str, int]]): The (kind, id) records to reload.
+        session (AsyncSession): The database session.
+    """
+    if not typeahead_index.loaded:
+        return
+    for kind, id in keys:
+        model = SubjectModel if kind == "subject" else TopicModel
+        result = await session.execute(select(model).where(model.id == id))
+        row = result.scalar()
+        if row is None:
+            typeahead_index.remove(kind, id)
+            continue
+        typeahead_index.apply(row)
+        if kind == "subject":
+            topics = await session.execute(
+                select(TopicModel).where(TopicModel.subject_id == id)
+            )
+            for topic in topics.scalars():
+                typeahead_index.apply(topic)
@@ -0,0 +1,91 @@
+"""
+Compare commits and throughput of subject writes with and without coalescing.
+
+Runs a number of concurrent clients that each create subjects and then
+edit them through the services, once with `WRITE_COALESCING_ENABLED` off
+and once with it on. Writes per second and database commits per second
+are reported; with coalescing, one commit covers a whole group of writes.
+
+Usage:
+    python -m benchmarks.group_commit [clients] [writes_per_client]
+
+Needs a migrated database; the created rows are deleted at the end.
+"""
+
+import asyncio
+import sys
+import time
+
+from sqlalchemy import event, text
+
+from app.db.connection import async_session_maker, engine
+from app.schemas.subjects import SubjectCreateEditSchema
+from app.services import subjects
+from config import settings
+
+PREFIX = "group commit"
+PATTERN = f"{PREFIX} %"
+
+commits = 0
+
+
+@event.listens_for(engine.sync_engine, "commit")
+def count_commit(connection):
+    global commits
+    commits += 1
+
+
+async def cleanup():
+    async with engine.begin() as connection:
+        await connection.execute(
+            text("DELETE FROM subjects WHERE title LIKE :pattern"),
+            {"pattern": PATTERN},
+        )
+
+
+async def client(mode: str, number: int, writes: int):
+    ids = []
+    for n in range(writes // 2):
+        subject = SubjectCreateEditSchema(title=f"{PREFIX} {mode} {number} {n}")
+        async with async_session_maker() as session:
+            created = await subjects.create_service(subject, session)
+        ids.append(created.id)
+    for n, subject_id in enumerate(ids):
+        subject = SubjectCreateEditSchema(title=f"{PREFIX} {mode} {number} {n} edited")
+        async with async_session_maker() as session:
+            await subjects.edit_service(subject_id, subject, session)
+
+
+async def measure(mode: str, clients: int, writes: int) -> tuple[float, float]:
+    global commits
+    settings.WRITE_COALESCING_ENABLED = mode == "coalesced"
+    commits = 0
+    started = time.perf_counter()
+    await asyncio.gather(*(client(mode, number, writes) for number in range(clients)))
+    elapsed = time.perf_counter() - started
+    total = clients * (writes // 2) * 2
+    return total / elapsed, commits / elapsed
+
+
+async def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    writes = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+
+    try:
+        print(
+            f"{'mode':10s} {'writes/s':>10s} {'commits/s':>10s} {'writes/commit':>14s}"
+        )
+        for mode in ("plain", "coalesced"):
+            writes_per_second, commits_per_second = await measure(mode, clients, writes)
+            print(
+                f"{mode:10s} {writes_per_second:10.0f} {commits_per_second:10.0f} "
+                f"{writes_per_second / commits_per_second:14.1f}"
+            )
+    finally:
+        settings.WRITE_COALESCING_ENABLED = False
+        await cleanup()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
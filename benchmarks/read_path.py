@@ -0,0 +1,134 @@
+"""
+Compare the ORM and raw asyncpg read paths of the hot read services.
+
+Seeds subjects and topics, then calls each read service repeatedly with
+`DB_READ_PATH` set to "orm" and to "raw" against the same rows, including
+serialization through the route's response model. Wall time and process
+CPU time per call are reported; CPU time is where ORM hydration shows up.
+
+Usage:
+    python -m benchmarks.read_path [subjects] [topics_per_subject] [iterations]
+
+Needs a migrated database; the seeded rows are deleted at the end.
+"""
+
+import asyncio
+import sys
+import time
+
+from pydantic import TypeAdapter
+from sqlalchemy import text
+
+from app.db.connection import async_session_maker, engine
+from app.schemas.subjects import SubjectResponseSchema, SubjectWithTopicsResponseSchema
+from app.schemas.topics import TopicPageResponseSchema, TopicResponseSchema
+from app.services import subjects, topics
+from config import settings
+
+PREFIX = "read path"
+PATTERN = f"{PREFIX} %"
+
+
+async def seed(subject_count: int, topics_per_subject: int) -> int:
+    async with engine.begin() as connection:
+        await connection.execute(
+            text(
+                "INSERT INTO subjects (title, created_at) "
+                "SELECT CAST(:prefix AS text) || ' ' || n, now() "
+                "FROM generate_series(1, :subjects) AS n"
+            ),
+            {"prefix": PREFIX, "subjects": subject_count},
+        )
+        await connection.execute(
+            text(
+                "INSERT INTO topics (title, description, subject_id, created_at) "
+                "SELECT CAST(:prefix AS text) || ' ' || s.id || ' ' || n, "
+                "'description', s.id, now() "
+                "FROM subjects AS s, generate_series(1, :topics) AS n "
+                "WHERE s.title LIKE :pattern"
+            ),
+            {"prefix": PREFIX, "pattern": PATTERN, "topics": topics_per_subject},
+        )
+        result = await connection.execute(
+            text("SELECT min(id) FROM subjects WHERE title LIKE :pattern"),
+            {"pattern": PATTERN},
+        )
+        return result.scalar()
+
+
+async def cleanup():
+    async with engine.begin() as connection:
+        await connection.execute(
+            text("DELETE FROM subjects WHERE title LIKE :pattern"),
+            {"pattern": PATTERN},
+        )
+
+
+def cases(subject_id: int) -> list:
+    return [
+        (
+            "subjects.get_list_service",
+            lambda session: subjects.get_list_service(session),
+            TypeAdapter(list[SubjectResponseSchema]),
+        ),
+        (
+            "subjects.get_one_service",
+            lambda session: subjects.get_one_service(subject_id, session),
+            TypeAdapter(SubjectWithTopicsResponseSchema),
+        ),
+        (
+            "topics.get_list_service",
+            lambda session: topics.get_list_service(session),
+            TypeAdapter(list[TopicResponseSchema]),
+        ),
+        (
+            "topics.get_by_subject_service",
+            lambda session: topics.get_by_subject_service(
+                subject_id, 0, settings.TOPICS_PAGE_SIZE, session
+            ),
+            TypeAdapter(TopicPageResponseSchema),
+        ),
+    ]
+
+
+async def measure(call, adapter: TypeAdapter, iterations: int) -> tuple[float, float]:
+    # One warm-up call so both paths start with prepared statements.
+    async with async_session_maker() as session:
+        await call(session)
+
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    for _ in range(iterations):
+        async with async_session_maker() as session:
+            result = await call(session)
+        adapter.dump_json(adapter.validate_python(result, from_attributes=True))
+    wall = time.perf_counter() - wall
+    cpu = time.process_time() - cpu
+    return wall / iterations * 1000, cpu / iterations * 1000
+
+
+async def main():
+    subject_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    topics_per_subject = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    iterations = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+
+    subject_id = await seed(subject_count, topics_per_subject)
+    try:
+        print(f"{'service':30s} {'path':4s} {'wall ms':>9s} {'cpu ms':>9s}")
+        for name, call, adapter in cases(subject_id):
+            timings = {}
+            for path in ("orm", "raw"):
+                settings.DB_READ_PATH = path
+                timings[path] = await measure(call, adapter, iterations)
+                wall, cpu = timings[path]
+                print(f"{name:30s} {path:4s} {wall:9.2f} {cpu:9.2f}")
+            saved = 1 - timings["raw"][1] / timings["orm"][1]
+            print(f"{'':30s} raw path saves {saved:.0%} CPU")
+    finally:
+        settings.DB_READ_PATH = "orm"
+        await cleanup()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,147 @@
+"""
+Measure the per-request cost of the service statements against a database.
+
+Runs the same request, a subject read, a page of its topics and an edit
+of its title, in two setups:
+
+- "rebuilt": statements built on every call, as the services used to do,
+  on an engine without a pool. Every request opens a new connection, so
+  asyncpg's prepared statement cache starts empty and each statement is
+  prepared again.
+- "cached": the services' prebuilt and `lambda_stmt` statements on the
+  application's pooled engine, which reuses the compiled SQL and the
+  prepared statements of its connections.
+
+Wall time and process CPU time per request are reported.
+
+Usage:
+    python -m benchmarks.statement_cache [iterations]
+
+Needs a migrated database; the seeded rows are deleted at the end.
+"""
+
+import asyncio
+import sys
+import time
+
+from sqlalchemy import select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.db.connection import async_session_maker, engine
+from app.db.models import SubjectModel, TopicModel
+from app.services.subjects import (
+    UPDATE_SUBJECT,
+    select_subject_by_id,
+    select_topic_page,
+)
+from config import settings
+
+PREFIX = "statement cache"
+PATTERN = f"{PREFIX} %"
+TOPICS = 20
+
+unpooled_engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+unpooled_session_maker = sessionmaker(
+    unpooled_engine, class_=AsyncSession, expire_on_commit=False
+)
+
+
+async def seed() -> int:
+    async with engine.begin() as connection:
+        result = await connection.execute(
+            text(
+                "INSERT INTO subjects (title, created_at) "
+                "VALUES (CAST(:prefix AS text) || ' 1', now()) RETURNING id"
+            ),
+            {"prefix": PREFIX},
+        )
+        subject_id = result.scalar()
+        await connection.execute(
+            text(
+                "INSERT INTO topics (title, description, subject_id, created_at) "
+                "SELECT CAST(:prefix AS text) || ' ' || n, 'description', "
+                ":subject_id, now() FROM generate_series(1, :topics) AS n"
+            ),
+            {"prefix": PREFIX, "subject_id": subject_id, "topics": TOPICS},
+        )
+    return subject_id
+
+
+async def cleanup():
+    async with engine.begin() as connection:
+        result = await connection.execute(
+            text("DELETE FROM subjects WHERE title LIKE :pattern RETURNING id"),
+            {"pattern": PATTERN},
+        )
+        await connection.execute(
+            text("DELETE FROM tombstones WHERE subject_id = ANY(:ids)"),
+            {"ids": list(result.scalars())},
+        )
+
+
+async def rebuilt_request(subject_id: int):
+    async with unpooled_session_maker() as session:
+        await session.execute(select(SubjectModel).where(SubjectModel.id == subject_id))
+        await session.execute(
+            select(TopicModel)
+            .where(TopicModel.subject_id == subject_id, TopicModel.id > 0)
+            .order_by(TopicModel.id)
+            .limit(TOPICS + 1)
+        )
+        await session.execute(
+            update(SubjectModel)
+            .values(title=f"{PREFIX} 1")
+            .where(SubjectModel.id == subject_id)
+            .returning(SubjectModel)
+            .execution_options(synchronize_session=False)
+        )
+        await session.commit()
+
+
+async def cached_request(subject_id: int):
+    async with async_session_maker() as session:
+        await session.execute(select_subject_by_id(subject_id))
+        await session.execute(select_topic_page(subject_id, 0, TOPICS + 1))
+        await session.execute(
+            UPDATE_SUBJECT, {"subject_id": subject_id, "title": f"{PREFIX} 1"}
+        )
+        await session.commit()
+
+
+async def measure(request, subject_id: int, iterations: int) -> tuple[float, float]:
+    for _ in range(10):
+        await request(subject_id)
+    started, cpu_started = time.perf_counter(), time.process_time()
+    for _ in range(iterations):
+        await request(subject_id)
+    wall = (time.perf_counter() - started) / iterations * 1000
+    cpu = (time.process_time() - cpu_started) / iterations * 1000
+    return wall, cpu
+
+
+async def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+
+    subject_id = await seed()
+    try:
+        print(f"{'setup':8s} {'ms/request':>11s} {'CPU ms/request':>15s}")
+        results = {}
+        for name, request in (("rebuilt", rebuilt_request), ("cached", cached_request)):
+            results[name] = await measure(request, subject_id, iterations)
+            wall, cpu = results[name]
+            print(f"{name:8s} {wall:11.2f} {cpu:15.2f}")
+        (old_wall, old_cpu), (wall, cpu) = results["rebuilt"], results["cached"]
+        print(
+            f"saving   {old_wall - wall:11.2f} {old_cpu - cpu:15.2f} "
+            f"({1 - wall / old_wall:.0%} wall, {1 - cpu / old_cpu:.0%} CPU)"
+        )
+    finally:
+        await cleanup()
+        await unpooled_engine.dispose()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
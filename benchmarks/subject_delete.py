@@ -0,0 +1,94 @@
+"""
+Compare deleting a subject with many topics through the ORM.
+
+Seeds a subject with 100k topics and deletes it the way the admin does
+(`session.delete(subject)`), once with the relationship loading its children
+first (the previous behaviour) and once relying on the ON DELETE CASCADE
+foreign key (`passive_deletes=True`). It then times the bulk delete service.
+Wall time and peak Python memory are reported for each run.
+
+Usage:
+    python -m benchmarks.subject_delete [topics]
+
+Needs a migrated database; the benchmark only touches rows it creates.
+"""
+
+import asyncio
+import sys
+import time
+import tracemalloc
+
+from sqlalchemy import text
+from sqlalchemy.orm import configure_mappers
+
+from app.db.connection import async_session_maker, engine
+from app.db.models import SubjectModel
+from app.schemas.subjects import SubjectBulkDeleteSchema
+from app.services.subjects import bulk_delete_service
+
+
+async def seed(topics: int) -> int:
+    async with async_session_maker() as session:
+        result = await session.execute(
+            text(
+                "INSERT INTO subjects (title, created_at) "
+                "VALUES ('benchmark', now()) RETURNING id"
+            )
+        )
+        subject_id = result.scalar()
+        await session.execute(
+            text(
+                "INSERT INTO topics (title, description, subject_id, created_at) "
+                "SELECT 'topic ' || n, 'description', :subject_id, now() "
+                "FROM generate_series(1, :topics) AS n"
+            ),
+            {"subject_id": subject_id, "topics": topics},
+        )
+        await session.commit()
+        return subject_id
+
+
+async def orm_delete(subject_id: int):
+    async with async_session_maker() as session:
+        subject = await session.get(SubjectModel, subject_id)
+        await session.delete(subject)
+        await session.commit()
+
+
+async def bulk_delete(subject_id: int):
+    async with async_session_maker() as session:
+        await bulk_delete_service(SubjectBulkDeleteSchema(ids=[subject_id]), session)
+
+
+def set_passive_deletes(value: bool):
+    configure_mappers()
+    relationship = SubjectModel.topics.property
+    relationship.passive_deletes = value
+    relationship._dependency_processor.passive_deletes = value
+
+
+async def measure(name: str, topics: int, delete):
+    subject_id = await seed(topics)
+    tracemalloc.start()
+    start = time.perf_counter()
+    await delete(subject_id)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:28s} {elapsed:8.3f}s  peak {peak / 1024 / 1024:8.1f} MiB")
+
+
+async def main():
+    topics = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    set_passive_deletes(False)
+    await measure("ORM delete, loads topics", topics, orm_delete)
+    set_passive_deletes(True)
+    await measure("ORM delete, passive", topics, orm_delete)
+    await measure("bulk delete service", topics, bulk_delete)
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
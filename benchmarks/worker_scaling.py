@@ -0,0 +1,125 @@
+"""
+Measure how request throughput scales with the number of serve.py workers.
+
+For each worker count a server is started on a free port, warmed up, and
+loaded by several client processes using keep-alive HTTP/1.1 connections.
+
+Usage:
+    python -m benchmarks.worker_scaling [path] [workers ...]
+
+    python -m benchmarks.worker_scaling /healthz 1 2 4
+    python -m benchmarks.worker_scaling /api/subjects
+
+Requests to `/api/*` need a reachable database.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import time
+
+DURATION = 10
+CLIENT_PROCESSES = max(2, (os.cpu_count() or 2) // 2)
+CONNECTIONS_PER_CLIENT = 32
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def client_connection(port: int, path: str, deadline: float) -> int:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    request = f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode()
+    done = 0
+    while time.monotonic() < deadline:
+        writer.write(request)
+        headers = await reader.readuntil(b"\r\n\r\n")
+        length = 0
+        for line in headers.split(b"\r\n"):
+            if line.lower().startswith(b"content-length:"):
+                length = int(line.split(b":")[1])
+        await reader.readexactly(length)
+        done += 1
+    writer.close()
+    return done
+
+
+def client_process(port: int, path: str, deadline: float, results):
+    async def run():
+        counts = await asyncio.gather(
+            *(
+                client_connection(port, path, deadline)
+                for _ in range(CONNECTIONS_PER_CLIENT)
+            )
+        )
+        results.put(sum(counts))
+
+    asyncio.run(run())
+
+
+def wait_until_ready(port: int, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+def measure(workers: int, path: str) -> float:
+    port = free_port()
+    env = {
+        **os.environ,
+        "WEB_CONCURRENCY": str(workers),
+        "SERVER_HOST": "127.0.0.1",
+        "SERVER_PORT": str(port),
+    }
+    server = subprocess.Popen(
+        [sys.executable, "serve.py"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_ready(port)
+        time.sleep(1)
+
+        results = multiprocessing.Queue()
+        deadline = time.monotonic() + DURATION
+        clients = [
+            multiprocessing.Process(
+                target=client_process, args=(port, path, deadline, results)
+            )
+            for _ in range(CLIENT_PROCESSES)
+        ]
+        for client in clients:
+            client.start()
+        total = sum(results.get() for _ in clients)
+        for client in clients:
+            client.join()
+        return total / DURATION
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else "/healthz"
+    counts = [int(n) for n in sys.argv[2:]] or sorted({1, 2, os.cpu_count() or 1})
+
+    baseline = None
+    for workers in counts:
+        rps = measure(workers, path)
+        baseline = baseline or rps
+        print(f"{workers:3d} workers: {rps:10.0f} req/s  ({rps / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
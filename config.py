@@ -1,3 +1,4 @@
+from typing import Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -7,11 +8,72 @@ class Settings(BaseSettings):
 
     Attributes:
         DEBUG (bool): Flag to enable or disable debug mode. Default is True.
+        ADMIN_MODE (str): How the admin interface is mounted: "eager" at import time,
+            "lazy" on first access to /admin, or "disabled". Default is "eager".
+        ADMIN_ESTIMATED_COUNT_THRESHOLD (int): Table size above which admin list pages show
+            the planner's row estimate instead of an exact count; filtered counts stop at
+            this number. Default is 100000.
+        WARM_UP_ON_STARTUP (bool): Fill the connection pool and prepare the service
+            reads before serving traffic. Default is True.
         POSTGRES_HOST (str): The hostname for the PostgreSQL database.
         POSTGRES_PORT (int): The port number for the PostgreSQL database.
         POSTGRES_USER (str): The username for the PostgreSQL database.
         POSTGRES_PASSWORD (str): The password for the PostgreSQL database.
         POSTGRES_DB (str): The database name for the PostgreSQL database.
+        DB_POOL_SIZE (int): Number of persistent connections kept in the pool. Default is 5.
+        DB_MAX_OVERFLOW (int): Extra connections allowed above the pool size. Default is 10.
+        DB_PREPARED_STATEMENT_CACHE_SIZE (int): Per-connection asyncpg prepared statement cache size. Default is 100.
+        DB_PGBOUNCER_MODE (bool): Disable server-side statement caching and connection pooling so the
+            application can run behind PgBouncer in transaction pooling mode. Default is False.
+        DB_MAX_CONNECTIONS (int | None): Global connection budget shared by all workers. When set,
+            per-worker pools are shrunk so that they, plus one LISTEN connection per worker,
+            never exceed it. Default is None.
+        DB_STATEMENT_TIMEOUT_SECONDS (float | None): Longest time a query may run before Postgres
+            cancels it; 0 or None disables the limit. Default is 30.
+        DB_ROUTE_STATEMENT_TIMEOUTS (dict[str, float]): Statement timeouts for individual routes,
+            keyed by route path, e.g. {"/api/topics": 2}. Default is empty.
+        CANCEL_ON_DISCONNECT (bool): Cancel a request's handler and its running query when the
+            client disconnects before the response is sent. Default is True.
+        DB_READ_PATH (str): How the list and detail services read rows: "orm" builds model
+            instances, "raw" runs plain SQL on the asyncpg connection and returns dictionaries.
+            Default is "orm".
+        WRITE_COALESCING_ENABLED (bool): Collect concurrent subject and topic creates and edits
+            and write each group with one statement and one commit. Default is False.
+        WRITE_COALESCING_WINDOW_SECONDS (float): How long the first write of a group waits for
+            others to join it. Default is 0.005.
+        WRITE_COALESCING_MAX_BATCH (int): Number of writes that closes a group before the window
+            ends. Default is 100.
+        EVENTS_POLL_SECONDS (float): Interval at which the event stream reads the change feed when
+            no notification arrives. Default is 5.
+        EVENTS_QUEUE_SIZE (int): Events buffered per stream before a slow client is disconnected.
+            Default is 256.
+        EVENTS_KEEPALIVE_SECONDS (float): Interval of keep-alive comments on idle streams. Default is 15.
+        EVENTS_RETRY_MILLISECONDS (int): Reconnect delay suggested to clients. Default is 3000.
+        TYPEAHEAD_ENABLED (bool): Build the in-memory title index for /api/typeahead at startup;
+            when disabled, the endpoint answers 404. Default is True.
+        TYPEAHEAD_LOAD_TIMEOUT_SECONDS (float): How long loading the typeahead index may wait for
+            the change feed. Default is 10.
+        SUBJECT_TOPICS_LIMIT (int): Maximum number of topics embedded in a subject's detail
+            response. Default is 100.
+        TOPICS_PAGE_SIZE (int): Default page size of `/api/topics/subject/{id}`. Default is 100.
+        SNAPSHOT_ENABLED (bool): Serve catalog reads from a pre-serialized snapshot file that is
+            rebuilt in the background after writes. Default is False.
+        SNAPSHOT_DIR (str): Directory holding the snapshot files, shared by the workers of a host.
+            Default is "snapshots".
+        SNAPSHOT_DEBOUNCE_SECONDS (float): Quiet period after the last write before the snapshot
+            is rebuilt. Default is 2.
+        SNAPSHOT_MAX_DELAY_SECONDS (float): Longest time a change waits for the snapshot rebuild
+            while writes keep arriving. Default is 30.
+        MIGRATION_LOCK_TIMEOUT_SECONDS (float): How long a migration statement may wait for a
+            table lock before it gives up. Default is 5.
+        MIGRATION_LOCK_RETRIES (int): How often a migration run that hit the lock timeout is
+            retried. Default is 10.
+        WEB_CONCURRENCY (int | None): Number of worker processes started by serve.py. Defaults to
+            the CPU count; set by serve.py for the workers it spawns.
+        SERVER_HOST (str): Address serve.py binds to. Default is "0.0.0.0".
+        SERVER_PORT (int): Port serve.py binds to. Default is 8000.
+        GRACEFUL_SHUTDOWN_SECONDS (int): Time a worker gets to finish in-flight requests when it
+            is stopped or restarted. Default is 30.
 
     Properties:
         DATABASE_URL (str): The complete database URL for connecting to the PostgreSQL database.
@@ -21,6 +83,9 @@ class Settings(BaseSettings):
     """
 
     DEBUG: bool = False
+    ADMIN_MODE: Literal["eager", "lazy", "disabled"] = "eager"
+    ADMIN_ESTIMATED_COUNT_THRESHOLD: int = 100_000
+    WARM_UP_ON_STARTUP: bool = True
 
     POSTGRES_HOST: str
     POSTGRES_PORT: int
@@ -28,6 +93,43 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str
     POSTGRES_DB: str
 
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+    DB_PGBOUNCER_MODE: bool = False
+    DB_MAX_CONNECTIONS: int | None = None
+    DB_STATEMENT_TIMEOUT_SECONDS: float | None = 30
+    DB_ROUTE_STATEMENT_TIMEOUTS: dict[str, float] = {}
+    CANCEL_ON_DISCONNECT: bool = True
+    DB_READ_PATH: Literal["orm", "raw"] = "orm"
+    WRITE_COALESCING_ENABLED: bool = False
+    WRITE_COALESCING_WINDOW_SECONDS: float = 0.005
+    WRITE_COALESCING_MAX_BATCH: int = 100
+
+    EVENTS_POLL_SECONDS: float = 5
+    EVENTS_QUEUE_SIZE: int = 256
+    EVENTS_KEEPALIVE_SECONDS: float = 15
+    EVENTS_RETRY_MILLISECONDS: int = 3000
+
+    TYPEAHEAD_ENABLED: bool = True
+    TYPEAHEAD_LOAD_TIMEOUT_SECONDS: float = 10
+
+    SUBJECT_TOPICS_LIMIT: int = 100
+    TOPICS_PAGE_SIZE: int = 100
+
+    SNAPSHOT_ENABLED: bool = False
+    SNAPSHOT_DIR: str = "snapshots"
+    SNAPSHOT_DEBOUNCE_SECONDS: float = 2
+    SNAPSHOT_MAX_DELAY_SECONDS: float = 30
+
+    MIGRATION_LOCK_TIMEOUT_SECONDS: float = 5
+    MIGRATION_LOCK_RETRIES: int = 10
+
+    WEB_CONCURRENCY: int | None = None
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    GRACEFUL_SHUTDOWN_SECONDS: int = 30
+
     @property
     def DATABASE_URL(self) -> str:
         """
@@ -41,6 +143,52 @@ class Settings(BaseSettings):
             f"@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         )
 
+    def get_pool_limits(self, workers: int) -> tuple[int, int]:
+        """
+        Split the global connection budget across worker processes.
+
+        Outside PgBouncer mode each worker also keeps one connection for
+        `LISTEN`, opened outside the pool, which is taken from its share.
+
+        Args:
+            workers (int): The number of worker processes sharing the database.
+
+        Raises:
+            ValueError: If the budget leaves less than one connection per worker.
+
+        Returns:
+            tuple[int, int]: The per-worker pool size and max overflow.
+        """
+        if self.DB_MAX_CONNECTIONS is None:
+            return self.DB_POOL_SIZE, self.DB_MAX_OVERFLOW
+
+        per_worker = self.DB_MAX_CONNECTIONS // workers
+        if not self.DB_PGBOUNCER_MODE:
+            per_worker -= 1
+        if per_worker < 1:
+            raise ValueError(
+                f"DB_MAX_CONNECTIONS={self.DB_MAX_CONNECTIONS} is too small "
+                f"for {workers} workers"
+            )
+
+        pool_size = min(self.DB_POOL_SIZE, per_worker)
+        max_overflow = min(self.DB_MAX_OVERFLOW, per_worker - pool_size)
+        return pool_size, max_overflow
+
+    def get_statement_timeout(self, route_path: str | None) -> float | None:
+        """
+        Find the statement timeout that applies to a route.
+
+        Args:
+            route_path (str | None): The path template of the route, e.g. "/api/topics/{topic_id}".
+
+        Returns:
+            float | None: The timeout in seconds; 0 or None means no limit.
+        """
+        return self.DB_ROUTE_STATEMENT_TIMEOUTS.get(
+            route_path, self.DB_STATEMENT_TIMEOUT_SECONDS
+        )
+
     model_config = SettingsConfigDict(env_file=".env")
 
 
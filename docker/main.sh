@@ -1,40 +1,51 @@
 #!/bin/bash
 
-postgres_ready() {
+export APP_STARTED_AT="${APP_STARTED_AT:-$(date +%s.%N)}"
+
+# Wait for PostgreSQL from a single interpreter instead of starting a new
+# Python process for every attempt.
 python << END
 import asyncio
-import asyncpg
 import sys
 
-async def check_postgres():
-    try:
-        conn = await asyncpg.connect(
-            database="${POSTGRES_DB}",
-            user="${POSTGRES_USER}",
-            password="${POSTGRES_PASSWORD}",
-            host="${POSTGRES_HOST}",
-            port="${POSTGRES_PORT}",
-        )
-        await conn.close()
-        return True
-    except asyncpg.exceptions.PostgresError:
-        return False
+import asyncpg
+
 
 async def main():
-    if await check_postgres():
-        sys.exit(0)
-    else:
-        sys.exit(-1)
+    for _ in range(${POSTGRES_WAIT_SECONDS:-60} * 4):
+        try:
+            conn = await asyncpg.connect(
+                database="${POSTGRES_DB}",
+                user="${POSTGRES_USER}",
+                password="${POSTGRES_PASSWORD}",
+                host="${POSTGRES_HOST}",
+                port="${POSTGRES_PORT}",
+                timeout=2,
+            )
+            await conn.close()
+            return True
+        except (OSError, asyncio.TimeoutError, asyncpg.exceptions.PostgresError):
+            print("Waiting for PostgreSQL to become available...", file=sys.stderr)
+            await asyncio.sleep(0.25)
+    return False
+
 
-asyncio.run(main())
+sys.exit(0 if asyncio.run(main()) else 1)
 END
-}
-until postgres_ready; do
-  >&2 echo 'Waiting for PostgreSQL to become available...'
-  sleep 1
-done
+if [ $? -ne 0 ]; then
+  >&2 echo 'PostgreSQL did not become available'
+  exit 1
+fi
 >&2 echo 'PostgreSQL is available'
 
-alembic upgrade head
+# Migrations run once per deploy as a separate step (`main.sh migrate`, the
+# `migrate` service in docker-compose.yaml), not in every replica's boot.
+if [ "$1" = "migrate" ]; then
+  exec alembic upgrade head
+fi
+
+if [ "${RUN_MIGRATIONS:-false}" = "true" ]; then
+  alembic upgrade head
+fi
 
-uvicorn main:app --host 0.0.0.0 --port 8000
+exec python serve.py
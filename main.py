@@ -1,28 +1,77 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from sqladmin import Admin
+from sqlalchemy.exc import DBAPIError
 from app.db.connection import engine
+from app.db.warmup import warm_up
+from app.middlewares.disconnect import DisconnectMiddleware
 from app.middlewares.logs import LogsMiddleware
+from app.middlewares.snapshot import SnapshotMiddleware
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.routers.batch import router as batch_router
+from app.routers.changes import router as changes_router
+from app.routers.events import router as events_router
+from app.routers.health import router as health_router
 from app.routers.subjects import router as subjects_router
 from app.routers.topics import router as topics_router
+from app.routers.typeahead import router as typeahead_router
 
-from app.utils.sqladmin_configs import SubjectAdmin, TopicAdmin
+from app.utils.admin import mount_admin
+from app.utils.cancellation import statement_timeout_handler
+from app.utils.events import notifier
+from app.utils.snapshot import snapshot_builder, start_snapshots
+from app.utils.startup import mark_ready
+from app.utils.typeahead import load_typeahead_index
 
 from config import settings
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Warm up the worker before it serves traffic and release connections on shutdown.
+
+    Args:
+        app (FastAPI): The application instance.
+    """
+    if settings.WARM_UP_ON_STARTUP:
+        await warm_up()
+    if settings.TYPEAHEAD_ENABLED:
+        await load_typeahead_index()
+    if settings.SNAPSHOT_ENABLED:
+        start_snapshots()
+    mark_ready()
+    yield
+    await snapshot_builder.stop()
+    await notifier.stop()
+    await engine.dispose()
+
+
 app = FastAPI(
     title="FAQ | APIs",
     version="0.1",
     debug=settings.DEBUG,
+    lifespan=lifespan,
 )
 
+# Errors
+app.add_exception_handler(DBAPIError, statement_timeout_handler)
+
 # Routers
+app.include_router(health_router)
 app.include_router(subjects_router)
 app.include_router(topics_router)
+app.include_router(changes_router)
+app.include_router(events_router)
+app.include_router(typeahead_router)
+app.include_router(batch_router)
 
 # Middlewares
+if settings.SNAPSHOT_ENABLED:
+    app.add_middleware(SnapshotMiddleware)
 app.add_middleware(LogsMiddleware, some_attribute="")
+if settings.CANCEL_ON_DISCONNECT:
+    app.add_middleware(DisconnectMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -37,8 +86,5 @@ app.add_middleware(
     ],
 )
 
-admin = Admin(app, engine)
-
-# AdminPanel Pages
-admin.add_view(SubjectAdmin)
-admin.add_view(TopicAdmin)
+# AdminPanel
+mount_admin(app)
@@ -0,0 +1,67 @@
+"""
+Production entry point running the API in several worker processes.
+
+Usage:
+    python serve.py
+
+The number of workers defaults to the CPU count and can be set with
+`WEB_CONCURRENCY`. Send SIGHUP to the supervisor to restart the workers one
+by one; each worker finishes its in-flight requests before it exits.
+"""
+
+import os
+
+import uvicorn
+from uvicorn.supervisors import Multiprocess
+
+from app.utils.logging_configs import logger
+from config import settings
+
+
+class WorkerSupervisor(Multiprocess):
+    """
+    Uvicorn's worker supervisor, telling restarted workers they are not the first.
+
+    `APP_STARTED_AT`, exported by docker/main.sh, is the start of the
+    container. Only the first workers are started as part of it; workers
+    restarted on SIGHUP or respawned after a crash measure their start-up
+    from their own process start instead.
+    """
+
+    def init_processes(self):
+        super().init_processes()
+        os.environ.pop("APP_STARTED_AT", None)
+
+
+def main():
+    workers = settings.WEB_CONCURRENCY or os.cpu_count() or 1
+
+    # Fail before spawning anything if the connection budget cannot be split.
+    pool_size, max_overflow = settings.get_pool_limits(workers)
+
+    # Workers read the final count from the environment to size their pools.
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+
+    logger.info(
+        f"Starting {workers} workers, "
+        f"{pool_size}+{max_overflow} database connections each"
+    )
+    options = {
+        "host": settings.SERVER_HOST,
+        "port": settings.SERVER_PORT,
+        "workers": workers,
+        "loop": "uvloop",
+        "http": "httptools",
+        "timeout_graceful_shutdown": settings.GRACEFUL_SHUTDOWN_SECONDS,
+    }
+    if workers == 1:
+        uvicorn.run("main:app", **options)
+        return
+
+    config = uvicorn.Config("main:app", **options)
+    server = uvicorn.Server(config)
+    WorkerSupervisor(config, target=server.run, sockets=[config.bind_socket()]).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import os
+
+import pytest
+from sqlalchemy.engine import make_url
+
+# The application reads its database from the POSTGRES_* settings. Tests
+# that need a database use TEST_DATABASE_URL, a migrated throwaway
+# database, and are skipped without it; the others only need the settings
+# to load.
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+if TEST_DATABASE_URL:
+    url = make_url(TEST_DATABASE_URL)
+    os.environ.update(
+        POSTGRES_HOST=url.host or "localhost",
+        POSTGRES_PORT=str(url.port or 5432),
+        POSTGRES_USER=url.username or "",
+        POSTGRES_PASSWORD=url.password or "",
+        POSTGRES_DB=url.database or "",
+    )
+else:
+    for name in ("POSTGRES_HOST", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_DB"):
+        os.environ.setdefault(name, "test")
+    os.environ.setdefault("POSTGRES_PORT", "5432")
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
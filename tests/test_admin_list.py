@@ -0,0 +1,106 @@
+"""
+Render the admin list page with keyset cursors, the estimated count and search.
+
+The queries of the list page are recorded instead of run, so the check
+covers the page as SQLAdmin renders it without a database.
+"""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql.elements import TextClause
+from starlette.applications import Starlette
+from starlette.testclient import TestClient
+
+from app.db.models import SubjectModel
+from app.utils.sqladmin_configs import FastListMixin, create_admin
+
+ESTIMATE = 250_000
+SEARCH_COUNT = 42
+URL = "/admin/subject-model/list"
+
+
+class Recorder:
+    """
+    Stands in for `FastListMixin.run_query` and records the SQL it is given.
+
+    Attributes:
+        ids (list[int]): IDs of the subjects returned for a page, in query order.
+        statements (list[str]): The compiled statements, in the order they ran.
+    """
+
+    def __init__(self, ids: list[int]):
+        self.ids = ids
+        self.statements = []
+
+    async def run_query(self, stmt) -> list:
+        if isinstance(stmt, TextClause):
+            self.statements.append(str(stmt))
+            return [ESTIMATE]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        self.statements.append(sql)
+        if sql.startswith("SELECT count("):
+            return [SEARCH_COUNT]
+        now = datetime(2026, 1, 1)
+        return [
+            SubjectModel(id=id, title=f"subject {id}", created_at=now, updated_at=now)
+            for id in self.ids
+        ]
+
+
+@pytest.fixture
+def client():
+    app = Starlette()
+    create_admin(app)
+    return TestClient(app)
+
+
+def render(client, monkeypatch, ids: list[int], **params) -> tuple[str, list[str]]:
+    recorder = Recorder(ids)
+    monkeypatch.setattr(FastListMixin, "run_query", recorder.run_query)
+    response = client.get(URL, params=params)
+    assert response.status_code == 200
+    return response.text, recorder.statements
+
+
+def test_after_cursor(client, monkeypatch):
+    page, statements = render(client, monkeypatch, [99, 98, 97], page=2, after=100)
+
+    estimate, rows = statements
+    assert "pg_class" in estimate
+    assert "subjects.id < %(id_1)s" in rows
+    assert "ORDER BY subjects.id DESC" in rows
+    assert "OFFSET" not in rows
+    assert f"of <span>{ESTIMATE}</span>" in page
+    assert "page=3&amp;after=97" in page
+    assert "page=1&amp;before=99" in page
+
+
+def test_before_cursor(client, monkeypatch):
+    # The previous page is read in ascending order and shown in list order.
+    page, statements = render(client, monkeypatch, [101, 102, 103], page=2, before=100)
+
+    rows = statements[-1]
+    assert "subjects.id > %(id_1)s" in rows
+    assert "ORDER BY subjects.id ASC" in rows
+    assert "OFFSET" not in rows
+    assert (
+        page.index("subject 103")
+        < page.index("subject 102")
+        < page.index("subject 101")
+    )
+    assert "page=3&amp;after=101" in page
+    assert "page=1&amp;before=103" in page
+
+
+def test_search(client, monkeypatch):
+    page, statements = render(client, monkeypatch, [7], search="alg")
+
+    count, rows = statements
+    assert "subjects.title ILIKE %(title_1)s" in count
+    assert "LIMIT %(param_1)s" in count
+    assert "subjects.title ILIKE %(title_1)s" in rows
+    assert f"of <span>{SEARCH_COUNT}</span>" in page
+    assert "subject 7" in page
+    assert "page=2&amp;after=7" in page
@@ -0,0 +1,31 @@
+"""
+Check that a batch only calls the subject and topic CRUD routes.
+"""
+
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from app.db.connection import get_async_session
+from main import app
+
+
+def test_event_stream_is_not_found():
+    app.dependency_overrides[get_async_session] = lambda: SimpleNamespace(info={})
+    try:
+        response = TestClient(app).post(
+            "/api/batch",
+            json={
+                "operations": [
+                    {"method": "GET", "path": "/api/subjects/1/events"},
+                    {"method": "GET", "path": "/api/topics/subject/one"},
+                ]
+            },
+        )
+    finally:
+        app.dependency_overrides.pop(get_async_session)
+
+    assert response.status_code == 200
+    first, second = response.json()["results"]
+    assert first == {"status": 404, "body": {"detail": "Not Found"}}
+    assert second["status"] == 422
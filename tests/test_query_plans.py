@@ -0,0 +1,366 @@
+"""
+Check the query plans of every statement issued by the subject and topic services.
+
+Seeds a sizeable dataset, calls each service inside a transaction that is
+rolled back afterwards, and records the SQL it sends, including the
+queries of the raw read path and the group statements of the write
+coalescer. Every recorded statement is then run through
+`EXPLAIN (FORMAT JSON)` and checked:
+
+- no sequential scan of `subjects` or `topics`, unless the service
+  lists the whole table;
+- the indexes the service is expected to use appear in the plans;
+- the estimated total cost stays under the bound of the check.
+
+Needs TEST_DATABASE_URL pointing at a migrated throwaway database; the
+seeded rows and their tombstones are deleted at the end.
+"""
+
+import asyncio
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.db.connection import fetch_records
+from app.schemas.subjects import SubjectBulkDeleteSchema, SubjectCreateEditSchema
+from app.schemas.topics import TopicCreateEditSchema
+from app.services import subjects, topics
+from config import settings
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("TEST_DATABASE_URL"), reason="TEST_DATABASE_URL is not set"
+)
+
+PREFIX = "plan check"
+PATTERN = f"{PREFIX} %"
+SUBJECTS = 10_000
+TOPICS_PER_SUBJECT = 20
+SCANNED_TABLES = {"subjects", "topics"}
+EXPLAINED = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+INDEX_NODES = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+
+engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+
+
+@dataclass
+class Check:
+    """
+    Expectations for the statements issued by one service call.
+
+    Attributes:
+        name (str): The service being checked.
+        call (Callable): Calls the service with a session and the seeded IDs.
+        indexes (set[str]): Indexes that must appear in the plans.
+        seq_scans (set[str]): Tables the service may scan sequentially.
+        max_cost (float | None): Upper bound for the estimated cost of each statement.
+        reads (bool): Whether the service reads through `DB_READ_PATH`, so
+            it is checked with both read paths.
+    """
+
+    name: str
+    call: Callable[[AsyncSession, dict], Awaitable]
+    indexes: set[str] = field(default_factory=set)
+    seq_scans: set[str] = field(default_factory=set)
+    max_cost: float | None = 100
+    reads: bool = False
+
+
+def topic_data(ids: dict, title: str) -> TopicCreateEditSchema:
+    return TopicCreateEditSchema(
+        title=title, description="description", subject_id=ids["subject"]
+    )
+
+
+CHECKS = [
+    Check(
+        "subjects.get_list_service",
+        lambda session, ids: subjects.get_list_service(session),
+        seq_scans={"subjects"},
+        max_cost=None,
+        reads=True,
+    ),
+    Check(
+        "subjects.get_one_service",
+        lambda session, ids: subjects.get_one_service(ids["subject"], session),
+        indexes={"subjects_pkey", "ix_topics_subject_id_id"},
+        max_cost=500,
+        reads=True,
+    ),
+    Check(
+        "subjects.create_service",
+        lambda session, ids: subjects.create_service(
+            SubjectCreateEditSchema(title=f"{PREFIX} new"), session
+        ),
+        indexes={"ix_subjects_title"},
+    ),
+    Check(
+        "subjects.create_group",
+        lambda session, ids: subjects.create_group(
+            [{"title": f"{PREFIX} new 1"}, {"title": f"{PREFIX} new 2"}], session
+        ),
+        indexes={"ix_subjects_title"},
+    ),
+    Check(
+        "subjects.edit_service",
+        lambda session, ids: subjects.edit_service(
+            ids["subject"], SubjectCreateEditSchema(title=f"{PREFIX} edited"), session
+        ),
+        indexes={"subjects_pkey"},
+    ),
+    Check(
+        "subjects.edit_group",
+        lambda session, ids: subjects.edit_group(
+            [
+                {"subject_id": subject_id, "title": f"{PREFIX} edited {subject_id}"}
+                for subject_id in ids["subjects"][:2]
+            ],
+            session,
+        ),
+        indexes={"subjects_pkey"},
+    ),
+    Check(
+        "subjects.delete_service",
+        lambda session, ids: subjects.delete_service(ids["subject"], session),
+        indexes={"subjects_pkey"},
+    ),
+    Check(
+        "subjects.bulk_delete_service",
+        lambda session, ids: subjects.bulk_delete_service(
+            SubjectBulkDeleteSchema(ids=ids["subjects"]), session
+        ),
+        indexes={"subjects_pkey"},
+    ),
+    Check(
+        "topics.get_list_service",
+        lambda session, ids: topics.get_list_service(session),
+        seq_scans={"topics"},
+        max_cost=None,
+        reads=True,
+    ),
+    Check(
+        "topics.get_one_service",
+        lambda session, ids: topics.get_one_service(ids["topic"], session),
+        indexes={"topics_pkey"},
+        reads=True,
+    ),
+    Check(
+        "topics.get_by_subject_service",
+        lambda session, ids: topics.get_by_subject_service(
+            ids["subject"], 0, 100, session
+        ),
+        indexes={"ix_topics_subject_id_id"},
+        max_cost=500,
+        reads=True,
+    ),
+    Check(
+        "topics.create_service",
+        lambda session, ids: topics.create_service(
+            topic_data(ids, f"{PREFIX} new"), session
+        ),
+        indexes={"ix_topics_title"},
+    ),
+    Check(
+        "topics.create_group",
+        lambda session, ids: topics.create_group(
+            [
+                topic_data(ids, f"{PREFIX} new 1").model_dump(),
+                topic_data(ids, f"{PREFIX} new 2").model_dump(),
+            ],
+            session,
+        ),
+        indexes={"ix_topics_title"},
+    ),
+    Check(
+        "topics.edit_service",
+        lambda session, ids: topics.edit_service(
+            ids["topic"], topic_data(ids, f"{PREFIX} edited"), session
+        ),
+        indexes={"topics_pkey"},
+    ),
+    Check(
+        "topics.edit_group",
+        lambda session, ids: topics.edit_group(
+            [
+                {
+                    "topic_id": topic_id,
+                    **topic_data(ids, f"{PREFIX} edited {topic_id}").model_dump(),
+                }
+                for topic_id in ids["topics"][:2]
+            ],
+            session,
+        ),
+        indexes={"topics_pkey"},
+    ),
+    Check(
+        "topics.delete_service",
+        lambda session, ids: topics.delete_service(ids["topic"], session),
+        indexes={"topics_pkey"},
+    ),
+]
+
+CASES = [
+    pytest.param(check, read_path, id=f"{check.name}[{read_path}]")
+    for check in CHECKS
+    for read_path in (("orm", "raw") if check.reads else ("orm",))
+]
+
+
+async def seed(subject_count: int, topics_per_subject: int) -> dict:
+    async with engine.begin() as connection:
+        await connection.execute(
+            text(
+                "INSERT INTO subjects (title, created_at) "
+                "SELECT CAST(:prefix AS text) || ' ' || n, now() "
+                "FROM generate_series(1, :subjects) AS n"
+            ),
+            {"prefix": PREFIX, "subjects": subject_count},
+        )
+        await connection.execute(
+            text(
+                "INSERT INTO topics (title, description, subject_id, created_at) "
+                "SELECT CAST(:prefix AS text) || ' ' || s.id || ' ' || n, "
+                "'description', s.id, now() "
+                "FROM subjects AS s, generate_series(1, :topics) AS n "
+                "WHERE s.title LIKE :pattern"
+            ),
+            {"prefix": PREFIX, "pattern": PATTERN, "topics": topics_per_subject},
+        )
+        result = await connection.execute(
+            text(
+                "SELECT id FROM subjects WHERE title LIKE :pattern "
+                "ORDER BY id LIMIT 10"
+            ),
+            {"pattern": PATTERN},
+        )
+        subject_ids = list(result.scalars())
+        result = await connection.execute(
+            text(
+                "SELECT id FROM topics WHERE subject_id = :subject_id "
+                "ORDER BY id LIMIT 10"
+            ),
+            {"subject_id": subject_ids[0]},
+        )
+        topic_ids = list(result.scalars())
+
+    async with engine.connect() as connection:
+        connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+        await connection.execute(text("ANALYZE subjects"))
+        await connection.execute(text("ANALYZE topics"))
+
+    return {
+        "subject": subject_ids[0],
+        "subjects": subject_ids,
+        "topic": topic_ids[0],
+        "topics": topic_ids,
+    }
+
+
+async def cleanup():
+    async with engine.begin() as connection:
+        result = await connection.execute(
+            text("DELETE FROM subjects WHERE title LIKE :pattern RETURNING id"),
+            {"pattern": PATTERN},
+        )
+        # The delete trigger wrote a tombstone per subject into the change feed.
+        await connection.execute(
+            text("DELETE FROM tombstones WHERE subject_id = ANY(:ids)"),
+            {"ids": list(result.scalars())},
+        )
+    await engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def ids():
+    try:
+        yield asyncio.run(seed(SUBJECTS, TOPICS_PER_SUBJECT))
+    finally:
+        asyncio.run(cleanup())
+
+
+def walk(plan: dict):
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from walk(child)
+
+
+async def explain(connection, check: Check, statements: list) -> list[str]:
+    """
+    Explain the recorded statements of a check and collect the violations.
+
+    Returns:
+        list[str]: Why the check failed; empty if it passed.
+    """
+    errors = []
+    used = set()
+    for statement, parameters in statements:
+        result = await connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {statement}", tuple(parameters)
+        )
+        plan = result.scalar()
+        plan = (json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"]
+        summary = " ".join(statement.split())[:80]
+
+        for node in walk(plan):
+            if node.get("Node Type") in INDEX_NODES:
+                used.add(node["Index Name"])
+            table = node.get("Relation Name")
+            if (
+                node.get("Node Type") == "Seq Scan"
+                and table in SCANNED_TABLES
+                and table not in check.seq_scans
+            ):
+                errors.append(f"sequential scan of {table}: {summary}")
+        if check.max_cost is not None and plan["Total Cost"] > check.max_cost:
+            errors.append(
+                f"cost {plan['Total Cost']:.0f} > {check.max_cost:.0f}: {summary}"
+            )
+
+    for index in check.indexes - used:
+        errors.append(f"index {index} not used")
+    return errors
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("check, read_path", CASES)
+async def test_query_plans(check: Check, read_path: str, ids: dict, monkeypatch):
+    monkeypatch.setattr(settings, "DB_READ_PATH", read_path)
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(EXPLAINED):
+            statements.append((statement, parameters or ()))
+
+    # The raw read path runs its queries on the asyncpg connection, where
+    # SQLAlchemy's cursor events do not see them.
+    async def fetch_and_record(session, query, *args):
+        statements.append((query, args))
+        return await fetch_records(session, query, *args)
+
+    monkeypatch.setattr(subjects, "fetch_records", fetch_and_record)
+    monkeypatch.setattr(topics, "fetch_records", fetch_and_record)
+
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        session = AsyncSession(
+            bind=connection,
+            join_transaction_mode="create_savepoint",
+            expire_on_commit=False,
+        )
+        event.listen(engine.sync_engine, "before_cursor_execute", record)
+        try:
+            await check.call(session, ids)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+        errors = await explain(connection, check, statements)
+        await session.close()
+        await transaction.rollback()
+
+    assert statements, "no statements recorded"
+    assert not errors, "\n".join(errors)
@@ -0,0 +1,62 @@
+"""
+Check that a query cancelled by `statement_timeout` becomes a counted 503 on both read paths.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from asyncpg.exceptions import QueryCanceledError
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import DBAPIError
+
+from app.db.connection import get_async_session
+from app.utils import cancellation
+from config import settings
+from main import app
+
+
+def cancelled() -> QueryCanceledError:
+    return QueryCanceledError("canceling statement due to statement timeout")
+
+
+class TimedOutSession:
+    """
+    A session whose queries are all cancelled by the statement timeout.
+
+    The ORM path gets the error wrapped by SQLAlchemy; the raw path gets
+    it straight from asyncpg.
+    """
+
+    info = {}
+
+    async def execute(self, statement, *args, **kwargs):
+        raise DBAPIError(str(statement), (), cancelled())
+
+    async def connection(self):
+        return self
+
+    async def get_raw_connection(self):
+        return SimpleNamespace(driver_connection=self)
+
+    async def fetch(self, query, *args):
+        raise cancelled()
+
+
+@pytest.fixture
+def client():
+    app.dependency_overrides[get_async_session] = TimedOutSession
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_async_session)
+
+
+@pytest.mark.parametrize("read_path", ["orm", "raw"])
+@pytest.mark.parametrize("path", ["/api/subjects", "/api/topics/1"])
+def test_statement_timeout(client, monkeypatch, read_path, path):
+    monkeypatch.setattr(settings, "DB_READ_PATH", read_path)
+    timeouts = cancellation.statement_timeouts
+
+    response = client.get(path)
+
+    assert response.status_code == 503
+    assert response.json() == {"detail": "Query timed out"}
+    assert cancellation.statement_timeouts == timeouts + 1
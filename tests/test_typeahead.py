@@ -0,0 +1,45 @@
+"""
+Check that the typeahead index only buffers changes while it is being loaded.
+"""
+
+from fastapi.testclient import TestClient
+
+from app.db.models import SubjectModel
+from app.routers import typeahead
+from app.utils.typeahead import PrefixIndex
+from config import settings
+from main import app
+
+
+def test_changes_are_dropped_when_not_loading():
+    index = PrefixIndex()
+
+    index.apply(SubjectModel(id=1, title="Algebra"))
+
+    assert index.pending == []
+
+
+def test_changes_are_buffered_while_loading():
+    index = PrefixIndex()
+    index.loading = True
+    index.apply(SubjectModel(id=1, title="Algebra"))
+    index.loading = False
+
+    index.load([("subject", 2, "Geometry", 2)])
+
+    assert index.pending == []
+    assert [match["id"] for match in index.search("", 10)] == [1, 2]
+
+
+def test_disabled_typeahead_does_not_load(monkeypatch):
+    monkeypatch.setattr(settings, "TYPEAHEAD_ENABLED", False)
+
+    async def load():
+        raise AssertionError("the index must not be loaded")
+
+    monkeypatch.setattr(typeahead, "load_typeahead_index", load)
+
+    response = TestClient(app).get("/api/typeahead", params={"prefix": "alg"})
+
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Typeahead is disabled"}